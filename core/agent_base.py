@@ -22,7 +22,7 @@ class AgentCapability(str, Enum):
     OPTIMIZATION = "optimization"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResult:
     """Result returned by an agent after processing."""
     content: str
@@ -11,20 +11,28 @@ from nexus.core.agent_base import AgentCapability, AgentMessage, BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Optional setter hooks that main.py uses to inject shared services into agents
+_INJECTION_HOOKS = ("set_llm", "set_dependencies", "set_skill_loader")
+
 
 class AgentRegistry:
     """Discovers, registers, and manages specialist agents."""
 
     def __init__(self) -> None:
         self._agents: dict[str, BaseAgent] = {}
+        self._hooks: dict[str, frozenset[str]] = {}  # agent name -> injection hooks it has
 
     def register(self, agent: BaseAgent) -> None:
         self._agents[agent.name] = agent
+        self._hooks[agent.name] = frozenset(
+            h for h in _INJECTION_HOOKS if callable(getattr(agent, h, None))
+        )
         logger.info(f"Registered agent: {agent.name}")
 
     def unregister(self, name: str) -> None:
         if name in self._agents:
             del self._agents[name]
+            del self._hooks[name]
 
     def get(self, name: str) -> BaseAgent | None:
         return self._agents.get(name)
@@ -32,6 +40,10 @@ class AgentRegistry:
     def list_agents(self) -> list[BaseAgent]:
         return list(self._agents.values())
 
+    def with_hook(self, hook: str) -> list[BaseAgent]:
+        """Agents exposing the given injection hook (e.g. "set_llm"), resolved at registration."""
+        return [a for a in self._agents.values() if hook in self._hooks[a.name]]
+
     def find_by_capability(self, capability: AgentCapability) -> list[BaseAgent]:
         return [a for a in self._agents.values() if capability in a.capabilities]
 
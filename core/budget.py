@@ -38,6 +38,8 @@ class BudgetController:
         # Warning callback: fired once per day when usage crosses warning_threshold
         self._on_warning: Callable[[float], Awaitable[None]] | None = None
         self._warning_sent: bool = False
+        # get_status() snapshot, dropped whenever the counters change
+        self._status: dict[str, Any] | None = None
         self._load_state()
 
     def _load_state(self) -> None:
@@ -56,6 +58,7 @@ class BudgetController:
                 self._reset()
 
     def _save_state(self) -> None:
+        self._status = None  # every counter change is persisted through here
         data = {
             "tokens_used": self._tokens_used,
             "curiosity_ops_used": self._curiosity_ops_used,
@@ -91,6 +94,7 @@ class BudgetController:
         self._last_reset = datetime.now()
         self._history.clear()
         self._warning_sent = False  # allow warning to fire again next day
+        self._status = None
 
     async def check_and_maybe_reset(self) -> None:
         async with self._lock:
@@ -168,14 +172,21 @@ class BudgetController:
         return max(0, self.curiosity_daily_ops - self._curiosity_ops_used)
 
     def get_status(self) -> dict[str, Any]:
-        return {
-            "tokens_used": self._tokens_used,
-            "tokens_remaining": self.tokens_remaining,
-            "daily_limit": self.daily_limit,
-            "usage_ratio": round(self.usage_ratio, 4),
-            "is_warning": self.is_warning,
-            "is_exhausted": self.is_exhausted,
-            "request_count": self._request_count,
-            "curiosity_ops_used": self._curiosity_ops_used,
-            "curiosity_ops_remaining": self.curiosity_ops_remaining,
-        }
+        """Snapshot of the counters; shared between callers, so treat it as read-only.
+
+        Rebuilt only after tokens or curiosity ops are recorded (or the day resets),
+        so status/dashboard polling does not recompute it on every request.
+        """
+        if self._status is None:
+            self._status = {
+                "tokens_used": self._tokens_used,
+                "tokens_remaining": self.tokens_remaining,
+                "daily_limit": self.daily_limit,
+                "usage_ratio": round(self.usage_ratio, 4),
+                "is_warning": self.is_warning,
+                "is_exhausted": self.is_exhausted,
+                "request_count": self._request_count,
+                "curiosity_ops_used": self._curiosity_ops_used,
+                "curiosity_ops_remaining": self.curiosity_ops_remaining,
+            }
+        return self._status
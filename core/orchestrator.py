@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import json
 import logging
+import re
 import time
+from itertools import islice
 from typing import Any, AsyncIterator
 
 from nexus import config
@@ -47,8 +50,8 @@ _BASE_SYSTEM_PROMPT = """你是 Nexus AI，一個在本機運行的先進多代
 - 擁有多個專門代理人（Coder / Research / Reasoning / Vision 等）和技能模組可調用"""
 
 # Language detection patterns
-_LANG_CJK_RE = __import__('re').compile(r'[\u4e00-\u9fff\u3040-\u30ff]')
-_LANG_EN_RE  = __import__('re').compile(r'[a-zA-Z]{3,}')
+_LANG_CJK_RE = re.compile(r'[\u4e00-\u9fff\u3040-\u30ff]')
+_LANG_EN_RE  = re.compile(r'[a-zA-Z]{3,}')
 
 # Keywords that suggest specialist agent routing is needed
 SPECIALIST_TRIGGERS = {
@@ -101,6 +104,33 @@ SPECIALIST_TRIGGERS = {
     ],
 }
 
+# Lowercased keywords with their precomputed specificity weight (1 + len*0.08)
+_SPECIALIST_WEIGHTS: dict[str, list[tuple[str, float]]] = {
+    agent: [(kw.lower(), 1.0 + len(kw) * 0.08) for kw in keywords]
+    for agent, keywords in SPECIALIST_TRIGGERS.items()
+}
+# Last formatted "%H:%M:%S" stamp, reused while the wall-clock second is unchanged
+_ts_cache: tuple[int, str] = (0, "")
+
+
+def _clock_ts() -> str:
+    global _ts_cache
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    return _ts_cache[1]
+
+
+# Low-confidence answers that are really error/apology strings are not worth
+# an extra verification round-trip
+_VERIFY_SKIP_PREFIXES = ("抱歉", "Sorry", "Error", "⚠️")
+
+_ASCII_UPPER_RE = re.compile(r'[A-Z]')
+_CJK_CHAR_RE = re.compile(r'[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7ff]')
+_EXPLICIT_CMD_RE = re.compile(
+    r'^[\s]*(幫我|請你|請幫|麻煩|幫|寫一個|做一個|建立|查詢|搜尋|分析|找一下)'
+)
+
 
 class Orchestrator:
     """Central brain: skill-first → specialist agents → direct chat."""
@@ -121,11 +151,18 @@ class Orchestrator:
         )
         self.streams = ThreeStreamProcessor()
         self.max_hypotheses = config.get("orchestrator.max_parallel_hypotheses", 3)
+        self.verify_min_chars = config.get("orchestrator.verify_min_chars", 40)
         self._memory = None
         self._skill_loader = None
         self._conference = AgentConference(registry, llm, memory=None)
-        self._event_callbacks: list = []
+        self._event_callbacks: list[tuple[Any, bool]] = []  # (callback, is_async)
         self._request_count: int = 0  # for periodic working memory decay
+        # System message dicts keyed by language hint, valid for one skill index
+        self._system_msg_cache: dict[str, dict[str, str]] = {}
+        self._system_skill_index: str = ""
+        # Interactions waiting to be stored; oldest dropped when full
+        self._remember_q: asyncio.Queue[tuple[str, AgentResult]] = asyncio.Queue(maxsize=64)
+        self._remember_task: asyncio.Task | None = None
 
     def set_memory(self, memory) -> None:
         self._memory = memory
@@ -136,26 +173,40 @@ class Orchestrator:
 
     def _build_system_prompt(self, user_input: str = "") -> str:
         """Build system prompt with dynamic skill index injection."""
+        return self._system_message(user_input)["content"]
+
+    def _system_message(self, user_input: str = "") -> dict[str, str]:
+        """Return the system message dict, memoized per (skill index, language hint).
+
+        The dict is shared between calls — callers must not mutate it.
+        """
+        skill_index = self._skill_loader.get_index_text() if self._skill_loader else ""
+        lang_hint = self._detect_language(user_input) if user_input else ""
+        if skill_index != self._system_skill_index:
+            self._system_msg_cache.clear()
+            self._system_skill_index = skill_index
+        msg = self._system_msg_cache.get(lang_hint)
+        if msg is not None:
+            return msg
+
         prompt = _BASE_SYSTEM_PROMPT
 
         # Dynamic Skill Prompt injection (Golem Pattern 3)
-        if self._skill_loader:
-            skill_index = self._skill_loader.get_index_text()
-            if skill_index:
-                prompt += (
-                    "\n\n可用技能（使用者可直接觸發）:\n"
-                    + skill_index
-                )
+        if skill_index:
+            prompt += (
+                "\n\n可用技能（使用者可直接觸發）:\n"
+                + skill_index
+            )
 
         # Inject language reinforcement based on detected user language
-        if user_input:
-            lang_hint = self._detect_language(user_input)
-            if lang_hint:
-                prompt += f"\n\n{lang_hint}"
+        if lang_hint:
+            prompt += f"\n\n{lang_hint}"
 
         # Inject Titan Protocol format instructions
         prompt = TitanProtocol.inject_prompt(prompt)
-        return prompt
+        msg = {"role": "system", "content": prompt}
+        self._system_msg_cache[lang_hint] = msg
+        return msg
 
     @staticmethod
     def _detect_language(text: str) -> str:
@@ -169,21 +220,46 @@ class Orchestrator:
         return ""
 
     def on_event(self, callback) -> None:
-        self._event_callbacks.append(callback)
+        """Register an event callback; both sync and async callables are accepted."""
+        is_async = inspect.iscoroutinefunction(callback) or inspect.iscoroutinefunction(
+            getattr(callback, "__call__", None)
+        )
+        self._event_callbacks.append((callback, is_async))
 
-    async def _emit(self, event_type: str, content: str, **meta) -> None:
-        event = StreamEvent(
+    async def _dispatch(self, event: StreamEvent) -> None:
+        for cb, is_async in self._event_callbacks:
+            try:
+                if is_async:
+                    await cb(event)
+                else:
+                    cb(event)
+            except Exception as e:
+                logger.debug(f"Event callback {cb!r} failed: {e}")
+
+    @staticmethod
+    def _event(event_type: str, content: str, **meta) -> StreamEvent:
+        return StreamEvent(
             stream="orchestrator",
             event_type=event_type,
             content=content,
             metadata=meta,
         )
+
+    async def _emit(self, event_type: str, content: str, **meta) -> None:
+        event = self._event(event_type, content, **meta)
         await self.streams.emit(event)
-        for cb in self._event_callbacks:
-            try:
-                await cb(event)
-            except Exception:
-                pass
+        if self._event_callbacks:
+            await self._dispatch(event)
+
+    async def _emit_batch(self, events: list[StreamEvent]) -> None:
+        """Flush queued trace events in one pass over subscribers."""
+        if not events:
+            return
+        await self.streams.emit_batch(events)
+        if self._event_callbacks:
+            for event in events:
+                await self._dispatch(event)
+        events.clear()
 
     async def process(
         self,
@@ -193,12 +269,14 @@ class Orchestrator:
         force_agent: str | None = None,
     ) -> AsyncIterator[StreamEvent]:
         """Process user input: skills → agents → chat, yielding events."""
-        ts = time.strftime("%H:%M:%S")
-        await self._emit("received", f"[{ts}] Received: {user_input[:80]}")
+        ts = _clock_ts()
+        # Trace events for the fast paths are queued and flushed together
+        pending = [self._event("received", f"[{ts}] Received: {user_input[:80]}")]
 
         # Step 1: Check budget
         if self.budget.is_exhausted:
-            await self._emit("budget_exhausted", "Daily budget exhausted.")
+            pending.append(self._event("budget_exhausted", "Daily budget exhausted."))
+            await self._emit_batch(pending)
             yield StreamEvent("orchestrator", "final_answer",
                               "今日的 API 額度已用完，請等待午夜自動重置。")
             return
@@ -223,14 +301,19 @@ class Orchestrator:
         if self._skill_loader and not force_agent:
             skill = self._skill_loader.match(user_input)
             if skill:
-                await self._emit("routing", f"[{ts}] Skill matched: {skill.name}")
+                pending.append(self._event("routing", f"[{ts}] Skill matched: {skill.name}"))
+                pending.append(self._event("routed", f"Skill: '{skill.name}' activated"))
                 result = await self._skill_path(user_input, skill, session_id)
+                await self._emit_batch(pending)
                 yield StreamEvent("orchestrator", "final_answer", result.content)
                 await self._post_process(user_input, result, session_id)
                 status = self.budget.get_status()
                 await self._emit("budget_status", json.dumps(status))
                 return
 
+        # Slower paths below wait on the LLM, so surface progress right away
+        await self._emit_batch(pending)
+
         # Step 5: Check if conference mode is warranted
         team_key = self._conference.should_conference(user_input)
         if team_key:
@@ -249,14 +332,20 @@ class Orchestrator:
             await self._emit("budget_status", json.dumps(status))
             return
 
+        # Both remaining paths need memory context — start the search now so it
+        # overlaps with routing and agent dispatch
+        memory_task = asyncio.create_task(self._get_memory_context(user_input))
+
         # Step 6: Check specialist agents (keyword match, 0 tokens)
         specialist = force_agent or self._detect_specialist(user_input)
         if specialist:
             await self._emit("routing", f"[{ts}] Specialist detected: {specialist}")
-            result = await self._specialist_path(user_input, specialist, history, session_id, extra_context)
+            result = await self._specialist_path(
+                user_input, specialist, history, session_id, extra_context, memory_task,
+            )
         else:
             await self._emit("routing", f"[{ts}] Direct chat mode")
-            result = await self._chat_path(user_input, history, session_id)
+            result = await self._chat_path(user_input, history, session_id, memory_task)
 
         # Step 7: Yield final answer
         logger.info(f"Final answer: {len(result.content)} chars, confidence={result.confidence}")
@@ -277,7 +366,7 @@ class Orchestrator:
                 await self._memory.session.add_message(session_id, "assistant", result.content)
             except Exception as e:
                 logger.warning(f"Session save error: {e}")
-            asyncio.create_task(self._remember(user_input, result))
+            self._enqueue_remember(user_input, result)
             # Periodically decay working memory attention weights (every 10 requests)
             if self._request_count % 10 == 0:
                 try:
@@ -288,8 +377,6 @@ class Orchestrator:
 
     async def _skill_path(self, user_input: str, skill, session_id: str) -> AgentResult:
         """Execute a skill directly."""
-        await self._emit("routed", f"Skill: '{skill.name}' activated")
-
         context = {
             "llm": self.llm, "memory": self._memory,
             "session_id": session_id, "skill_loader": self._skill_loader,
@@ -309,26 +396,23 @@ class Orchestrator:
         Scoring: longer/more-specific keywords get higher weight (1 + len*0.08).
         Threshold scales with input length to reduce false positives on long texts.
         """
-        import re
-        text = user_input.lower()
+        # CJK has no case — only pay for .lower() when there is something to fold
+        text = user_input.lower() if _ASCII_UPPER_RE.search(user_input) else user_input
 
         # CJK-aware approximate word count
-        cjk_chars = len(re.findall(r'[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7ff]', text))
+        cjk_chars = len(_CJK_CHAR_RE.findall(text))
         approx_words = max(len(text.split()), cjk_chars)
 
         # Explicit command prefix lowers the threshold (user clearly wants action)
-        is_explicit_cmd = bool(re.search(
-            r'^[\s]*(幫我|請你|請幫|麻煩|幫|寫一個|做一個|建立|查詢|搜尋|分析|找一下)',
-            user_input,
-        ))
+        is_explicit_cmd = bool(_EXPLICIT_CMD_RE.search(user_input))
 
         scores: dict[str, float] = {}
-        for agent_name, keywords in SPECIALIST_TRIGGERS.items():
+        for agent_name, keywords in _SPECIALIST_WEIGHTS.items():
             total = 0.0
-            for kw in keywords:
-                if kw.lower() in text:
+            for kw, weight in keywords:
+                if kw in text:
                     # Longer keywords are more specific → higher weight
-                    total += 1.0 + len(kw) * 0.08
+                    total += weight
 
             if total == 0:
                 continue
@@ -359,13 +443,17 @@ class Orchestrator:
             return ""
 
     async def _chat_path(
-        self, user_input: str, history: list[dict], session_id: str
+        self, user_input: str, history: list[dict], session_id: str,
+        memory_task: asyncio.Task[str] | None = None,
     ) -> AgentResult:
         """Direct chat: send conversation history + new message to LLM."""
-        system_prompt = self._build_system_prompt(user_input)
-        messages = [{"role": "system", "content": system_prompt}]
+        messages = [self._system_message(user_input)]
 
-        memory_context = await self._get_memory_context(user_input)
+        memory_context, experience_context, pyramid_context = await asyncio.gather(
+            memory_task or self._get_memory_context(user_input),
+            self._get_experience_context(),
+            self._get_pyramid_context(),
+        )
         if memory_context:
             messages.append({
                 "role": "system",
@@ -373,7 +461,6 @@ class Orchestrator:
             })
 
         # Experience Memory injection (Golem Pattern 4)
-        experience_context = await self._get_experience_context()
         if experience_context:
             messages.append({
                 "role": "system",
@@ -381,15 +468,18 @@ class Orchestrator:
             })
 
         # Pyramid long-term memory injection
-        pyramid_context = await self._get_pyramid_context()
         if pyramid_context:
             messages.append({
                 "role": "system",
                 "content": pyramid_context,
             })
 
-        for msg in history:
-            messages.append(msg)
+        # process() saves the user turn before loading history, so it usually
+        # already ends with user_input — skip it without copying the list.
+        n_history = len(history)
+        if n_history and history[-1].get("role") == "user" and history[-1].get("content") == user_input:
+            n_history -= 1
+        messages.extend(islice(history, n_history))
         messages.append({"role": "user", "content": user_input})
 
         try:
@@ -409,6 +499,7 @@ class Orchestrator:
     async def _specialist_path(
         self, user_input: str, agent_name: str, history: list[dict],
         session_id: str, extra_context: dict | None = None,
+        memory_task: asyncio.Task[str] | None = None,
     ) -> AgentResult:
         """Route to a specialist agent with context."""
         await self._emit("routed", f"Complexity: specialist, Agents: ['{agent_name}']")
@@ -416,9 +507,12 @@ class Orchestrator:
         agent = self.registry.get(agent_name)
         if not agent:
             logger.warning(f"Agent '{agent_name}' not found, falling back to chat")
-            return await self._chat_path(user_input, history, session_id)
+            return await self._chat_path(user_input, history, session_id, memory_task)
 
-        memory_context = await self._get_memory_context(user_input)
+        memory_context, pyramid_context = await asyncio.gather(
+            memory_task or self._get_memory_context(user_input),
+            self._get_pyramid_context(),
+        )
         recent_history = ""
         if history:
             recent = history[-6:]
@@ -428,9 +522,6 @@ class Orchestrator:
                 parts.append(f"{role}: {msg['content'][:200]}")
             recent_history = "\n".join(parts)
 
-        # Pyramid long-term memory context
-        pyramid_context = await self._get_pyramid_context()
-
         message = AgentMessage(
             role="user", content=user_input, sender="user",
             metadata=extra_context or {},
@@ -457,7 +548,7 @@ class Orchestrator:
 
             await self._emit("selected", f"Agent '{agent_name}' responded (confidence={result.confidence:.2f})")
 
-            if result.confidence < 0.6:
+            if result.confidence < 0.6 and self._worth_verifying(result):
                 try:
                     vr = await self.verifier.verify(
                         user_input, result.content, self.llm.simple_call,
@@ -471,10 +562,17 @@ class Orchestrator:
             return result
         except asyncio.TimeoutError:
             logger.error(f"Specialist '{agent_name}' timed out (30s), falling back to chat")
-            return await self._chat_path(user_input, history, session_id)
+            return await self._chat_path(user_input, history, session_id, memory_task)
         except Exception as e:
             logger.error(f"Specialist '{agent_name}' failed: {e}", exc_info=True)
-            return await self._chat_path(user_input, history, session_id)
+            return await self._chat_path(user_input, history, session_id, memory_task)
+
+    def _worth_verifying(self, result: AgentResult) -> bool:
+        """Early-out for answers where verification can't add anything."""
+        content = result.content
+        if result.confidence <= 0.0 or len(content) <= self.verify_min_chars:
+            return False
+        return not content.lstrip().startswith(_VERIFY_SKIP_PREFIXES)
 
     async def _process_titan_result(self, titan: TitanResult, session_id: str) -> None:
         """Process Titan Protocol memory and action sections."""
@@ -529,6 +627,23 @@ class Orchestrator:
             logger.warning(f"Experience context error: {e}")
             return ""
 
+    def _enqueue_remember(self, query: str, result: AgentResult) -> None:
+        """Hand an interaction to the background memory writer."""
+        if self._remember_task is None or self._remember_task.done():
+            self._remember_task = asyncio.create_task(self._remember_worker())
+        try:
+            self._remember_q.put_nowait((query, result))
+        except asyncio.QueueFull:
+            self._remember_q.get_nowait()
+            logger.warning("Memory store queue full, dropping oldest interaction")
+            self._remember_q.put_nowait((query, result))
+
+    async def _remember_worker(self) -> None:
+        """Single long-lived consumer that stores interactions off the hot path."""
+        while True:
+            query, result = await self._remember_q.get()
+            await self._remember(query, result)
+
     async def _remember(self, query: str, result: AgentResult) -> None:
         try:
             if self._memory:
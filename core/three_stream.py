@@ -3,20 +3,67 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from dataclasses import dataclass, field
 from typing import Any, AsyncIterator
 
+
+def _default(obj: Any) -> Any:
+    """Fallback for metadata values JSON has no type for (sets, custom objects)."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+try:
+    import orjson
+
+    # NON_STR_KEYS matches json.dumps (int keys in metadata are common);
+    # SERIALIZE_NUMPY lets score arrays through without manual conversion
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTS).decode()
+except ImportError:  # optional speedup
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, default=_default)
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class StreamEvent:
-    """An event emitted by one of the three streams."""
+    """An event emitted by one of the three streams.
+
+    Frozen because the encoded frame is cached and shared by every sender.
+    """
     stream: str  # "think", "act", "remember"
     event_type: str  # e.g., "hypothesis", "action", "memory_store"
     content: str
     metadata: dict[str, Any] = field(default_factory=dict)
+    _json: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    def payload(self) -> dict[str, Any]:
+        """Wire-format dict sent to clients (see to_json)."""
+        return {
+            "type": self.event_type,
+            "stream": self.stream,
+            "content": self.content,
+            "metadata": self.metadata,
+        }
+
+    def to_json(self) -> str:
+        """WebSocket frame for this event.
+
+        Encoded on first use and reused by every sender and socket, so do not
+        mutate ``metadata`` after the event has been sent.
+        """
+        frame = self._json
+        if frame is None:
+            frame = _dumps(self.payload())
+            object.__setattr__(self, "_json", frame)  # cache slot on a frozen instance
+        return frame
 
 
 class ThreeStreamProcessor:
@@ -49,6 +96,17 @@ class ThreeStreamProcessor:
             except asyncio.QueueFull:
                 pass
 
+    async def emit_batch(self, events: list[StreamEvent]) -> None:
+        """Emit several events, walking the subscriber list once."""
+        if not events:
+            return
+        for sub in self._subscribers:
+            for event in events:
+                try:
+                    sub.put_nowait(event)
+                except asyncio.QueueFull:
+                    continue  # drop just this event for this subscriber, as emit() does
+
     async def run_parallel(
         self,
         think_coro,
@@ -76,11 +134,12 @@ class ThreeStreamProcessor:
                     content=str(e),
                 ))
 
-        await asyncio.gather(
-            _wrap("think", think_coro),
-            _wrap("act", act_coro),
-            _wrap("remember", remember_coro),
-        )
+        # _wrap records per-stream errors; the TaskGroup only propagates
+        # cancellation, so a cancelled caller never leaks a running stream.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_wrap("think", think_coro))
+            tg.create_task(_wrap("act", act_coro))
+            tg.create_task(_wrap("remember", remember_coro))
         return results
 
     async def event_stream(self) -> AsyncIterator[StreamEvent]:
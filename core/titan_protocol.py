@@ -10,22 +10,33 @@ response is treated as the reply section.
 
 from __future__ import annotations
 
+import json
 import re
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # optional speedup
+    _loads = json.loads
+
 
 # Section markers — keep them distinctive so the LLM can follow easily.
 _MEMORY_TAG = "[NEXUS_MEMORY]"
 _ACTION_TAG = "[NEXUS_ACTION]"
 _REPLY_TAG = "[NEXUS_REPLY]"
 
+_MEMORY_RE = re.compile(re.escape(_MEMORY_TAG), re.IGNORECASE)
+_ACTION_RE = re.compile(re.escape(_ACTION_TAG), re.IGNORECASE)
+_REPLY_RE = re.compile(re.escape(_REPLY_TAG), re.IGNORECASE)
+
 _SECTION_RE = re.compile(
     r"\[NEXUS_(?:MEMORY|ACTION|REPLY)\]",
     re.IGNORECASE,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class TitanResult:
     """Parsed three-part LLM response."""
 
@@ -74,9 +85,9 @@ class TitanProtocol:
             return result
 
         # Split by tags
-        memory_text = _extract_section(response, _MEMORY_TAG, _ACTION_TAG)
-        action_text = _extract_section(response, _ACTION_TAG, _REPLY_TAG)
-        reply_text = _extract_section(response, _REPLY_TAG, None)
+        memory_text = _extract_section(response, _MEMORY_RE, _ACTION_RE)
+        action_text = _extract_section(response, _ACTION_RE, _REPLY_RE)
+        reply_text = _extract_section(response, _REPLY_RE, None)
 
         # Memory
         result.memory = memory_text.strip()
@@ -84,9 +95,8 @@ class TitanProtocol:
         # Actions — try to parse as JSON array
         action_text = action_text.strip()
         if action_text:
-            import json
             try:
-                parsed = json.loads(action_text)
+                parsed = _loads(action_text)
                 if isinstance(parsed, list):
                     result.actions = parsed
                 elif isinstance(parsed, dict):
@@ -105,18 +115,18 @@ class TitanProtocol:
         return result
 
 
-def _extract_section(text: str, start_tag: str, end_tag: str | None) -> str:
-    """Extract text between start_tag and end_tag (or end of string)."""
-    start_idx = text.upper().find(start_tag.upper())
-    if start_idx == -1:
+def _extract_section(text: str, start_re: re.Pattern, end_re: re.Pattern | None) -> str:
+    """Extract text between the start tag and end tag (or end of string)."""
+    start = start_re.search(text)
+    if start is None:
         return ""
 
-    content_start = start_idx + len(start_tag)
+    content_start = start.end()
 
-    if end_tag is not None:
-        end_idx = text.upper().find(end_tag.upper(), content_start)
-        if end_idx == -1:
+    if end_re is not None:
+        end = end_re.search(text, content_start)
+        if end is None:
             return text[content_start:]
-        return text[content_start:end_idx]
+        return text[content_start:end.start()]
     else:
         return text[content_start:]
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from dataclasses import dataclass
 from typing import Any
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # optional speedup
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 VERIFY_PROMPT_TEMPLATE = """You are a critical verification assistant. Your job is to check whether the following answer is correct, complete, and logically sound.
@@ -23,8 +30,10 @@ Please analyze:
 Rate your confidence (0.0-1.0) that the answer is correct.
 Respond in JSON: {{"confidence": 0.X, "issues": ["..."], "suggestion": "..."}}"""
 
+_JSON_DECODER = json.JSONDecoder()
+
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     confidence: float
     issues: list[str]
@@ -45,17 +54,19 @@ class Verifier:
         llm_call,  # async callable(prompt) -> str
     ) -> VerificationResult:
         """Verify an answer using the LLM as a self-checker."""
-        import json
-
         prompt = VERIFY_PROMPT_TEMPLATE.format(question=question, answer=answer)
         try:
             response = await llm_call(prompt)
-            # Try to parse JSON from response
-            # Handle case where LLM wraps in markdown
             text = response.strip()
-            if text.startswith("```"):
-                text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
-            data = json.loads(text)
+            if text.startswith("{") and text.endswith("}"):
+                data = _loads(text)
+            else:
+                # Decode the first JSON object in the response — tolerates markdown
+                # fences and any commentary the LLM adds before or after it
+                start = text.find("{")
+                if start == -1:
+                    raise ValueError("no JSON object in response")
+                data, _ = _JSON_DECODER.raw_decode(text, start)
             confidence = float(data.get("confidence", 0.5))
             issues = data.get("issues", [])
             suggestion = data.get("suggestion", "")
@@ -3,13 +3,34 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import hashlib
+import heapq
+import inspect
+import itertools
+import json
 import logging
+import sys
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Awaitable
+from types import MappingProxyType
+from typing import Any, Callable, Awaitable, Mapping
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Python 3.12+ can start a task eagerly: it runs synchronously until its first
+# real suspension, so cache hits and trivial handlers finish without a loop trip
+_EAGER_TASKS = sys.version_info >= (3, 12)
+
+# Shared read-only dep_results for nodes without dependencies
+_EMPTY_MAP: Mapping[str, Any] = MappingProxyType({})
+
 
 class NodeStatus(str, Enum):
     PENDING = "pending"
@@ -30,14 +51,45 @@ class WorkflowNode:
     result: Any = None
     error: str | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Opt-in memoization: only for deterministic handlers
+    cacheable: bool = False
+    cache_context_keys: tuple[str, ...] = ()  # context entries that affect the result
+    cached: bool = False  # result came from the cache on the last run
+    concurrency_group: str | None = None  # named limit, see set_concurrency_limit()
+
+
+def _canonical(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
 
 
 class WorkflowEngine:
     """Executes workflows defined as DAGs with parallel node execution."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, max_parallel: int | None = None, cache_size: int = 128, fail_fast: bool = False,
+    ) -> None:
         self._nodes: dict[str, WorkflowNode] = {}
         self._on_node_complete: list[Callable] = []
+        # Scheduling state, rebuilt at the start of every execute()
+        self._dependents: dict[str, list[str]] = {}
+        self._remaining: dict[str, int] = {}
+        self._dep_ids: dict[str, tuple[str, ...]] = {}
+        self._ready: list[tuple[float, int, str]] = []  # heap of (-criticality, seq, id)
+        self._seq = itertools.count()
+        # Critical-path scheduling: expected cost hints and longest path to exit
+        self._costs: dict[str, float] = {}
+        self._criticality: dict[str, float] = {}
+        # LRU of results for cacheable nodes, keyed by a hash of their inputs
+        self._cache: OrderedDict[tuple[Callable, bytes], Any] = OrderedDict()
+        self._cache_size = cache_size
+        # Caps on concurrently running handlers: engine-wide and per named group
+        self._sem = asyncio.Semaphore(max_parallel) if max_parallel else None
+        self._group_sems: dict[str, asyncio.Semaphore] = {}
+        # Abort the whole run on the first failure instead of finishing
+        # the branches that do not depend on it
+        self._fail_fast = fail_fast
 
     def add_node(self, node: WorkflowNode) -> None:
         self._nodes[node.id] = node
@@ -45,78 +97,259 @@ class WorkflowEngine:
     def on_node_complete(self, callback: Callable) -> None:
         self._on_node_complete.append(callback)
 
-    def _get_ready_nodes(self) -> list[WorkflowNode]:
-        """Find nodes whose dependencies are all completed."""
-        ready = []
+    def set_concurrency_limit(self, group: str, limit: int) -> None:
+        """Cap nodes with concurrency_group=group (e.g. LLM calls) to limit at a time.
+
+        Grouped nodes use only their group's pool, not the engine-wide one.
+        """
+        self._group_sems[group] = asyncio.Semaphore(limit)
+
+    def _semaphore_for(self, node: WorkflowNode) -> asyncio.Semaphore | None:
+        if node.concurrency_group is not None and node.concurrency_group in self._group_sems:
+            return self._group_sems[node.concurrency_group]
+        return self._sem
+
+    def _build_graph(self) -> None:
+        """Index dependents and count unmet dependencies for every pending node.
+
+        Dependencies on unknown node ids are ignored. Nodes that sit on a
+        dependency cycle are left out of the schedule and stay PENDING.
+        """
+        self._dependents = {nid: [] for nid in self._nodes}
+        self._remaining = {}
+        self._dep_ids = {}
+        blocked: list[str] = []
         for node in self._nodes.values():
             if node.status != NodeStatus.PENDING:
                 continue
-            deps_met = all(
-                self._nodes[dep].status == NodeStatus.COMPLETED
-                for dep in node.depends_on
-                if dep in self._nodes
-            )
-            deps_failed = any(
-                self._nodes[dep].status == NodeStatus.FAILED
-                for dep in node.depends_on
-                if dep in self._nodes
+            self._dep_ids[node.id] = tuple(node.depends_on)
+            count = 0
+            for dep in node.depends_on:
+                dep_node = self._nodes.get(dep)
+                if dep_node is None:
+                    continue
+                if dep_node.status in (NodeStatus.FAILED, NodeStatus.SKIPPED):
+                    blocked.append(node.id)
+                elif dep_node.status != NodeStatus.COMPLETED:
+                    self._dependents[dep].append(node.id)
+                    count += 1
+            self._remaining[node.id] = count
+
+        # Kahn's algorithm over the pending subgraph to find unschedulable cycles
+        remaining = dict(self._remaining)
+        frontier = [nid for nid, n in remaining.items() if n == 0]
+        order: list[str] = []
+        while frontier:
+            nid = frontier.pop()
+            order.append(nid)
+            for child in self._dependents[nid]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    frontier.append(child)
+        for nid in self._remaining.keys() - set(order):
+            logger.warning("Workflow node %r is part of a dependency cycle, not scheduled", nid)
+            del self._remaining[nid]
+        self._compute_criticality(order)
+
+        # Dependencies that already failed in an earlier run skip their subtree now
+        for nid in blocked:
+            if nid in self._remaining:
+                self._nodes[nid].status = NodeStatus.SKIPPED
+                del self._remaining[nid]
+                self._skip_descendants(nid)
+
+    def set_node_cost(self, node_id: str, expected_ms: float) -> None:
+        """Hint how long a node is expected to run (e.g. an LLM call)."""
+        self._costs[node_id] = expected_ms
+
+    def _compute_criticality(self, order: list[str]) -> None:
+        """Longest expected path from each node to the end of the DAG.
+
+        Walks the topological order backwards so every child is scored before
+        its parents. Cost comes from set_node_cost(), metadata["expected_ms"],
+        or defaults to 1.
+        """
+        self._criticality = {}
+        for nid in reversed(order):
+            node = self._nodes[nid]
+            cost = self._costs.get(nid, node.metadata.get("expected_ms", 1))
+            tail = max(
+                (self._criticality[c] for c in self._dependents[nid] if c in self._criticality),
+                default=0,
             )
-            if deps_failed:
-                node.status = NodeStatus.SKIPPED
-            elif deps_met:
-                ready.append(node)
-        return ready
+            self._criticality[nid] = cost + tail
+
+    def _release(self, node: WorkflowNode) -> None:
+        """Node finished: unlock dependents, or skip its whole subtree if it failed."""
+        if node.status != NodeStatus.COMPLETED:
+            self._skip_descendants(node.id)
+            return
+        for child_id in self._dependents.get(node.id, ()):
+            if child_id not in self._remaining:
+                continue
+            self._remaining[child_id] -= 1
+            if self._remaining[child_id] == 0:
+                self._enqueue(self._nodes[child_id])
+
+    def _skip_descendants(self, node_id: str) -> None:
+        """Mark every still-scheduled node downstream of node_id as SKIPPED (BFS)."""
+        frontier = deque(self._dependents.get(node_id, ()))
+        while frontier:
+            child_id = frontier.popleft()
+            if self._remaining.pop(child_id, None) is None:
+                continue  # already skipped, or never scheduled
+            self._nodes[child_id].status = NodeStatus.SKIPPED
+            frontier.extend(self._dependents.get(child_id, ()))
+
+    def _enqueue(self, node: WorkflowNode) -> None:
+        """Queue a node whose dependencies have all completed."""
+        # Highest criticality first; the counter keeps FIFO order among ties
+        crit = self._criticality.get(node.id, 0)
+        heapq.heappush(self._ready, (-crit, next(self._seq), node.id))
 
     async def execute(self, context: dict[str, Any] | None = None) -> dict[str, Any]:
         """Execute the workflow, running independent nodes in parallel."""
         ctx = context or {}
         results: dict[str, Any] = {}
 
-        while True:
-            ready = self._get_ready_nodes()
-            if not ready:
-                # Check if all done
-                pending = [n for n in self._nodes.values() if n.status == NodeStatus.PENDING]
-                if not pending:
-                    break
-                running = [n for n in self._nodes.values() if n.status == NodeStatus.RUNNING]
-                if not running:
+        self._build_graph()
+        self._ready = []
+        self._seq = itertools.count()
+        for nid, count in list(self._remaining.items()):
+            if count == 0:
+                self._enqueue(self._nodes[nid])
+
+        # Children are released the moment any single node finishes — no
+        # wave barrier waiting on the slowest sibling
+        in_flight: dict[asyncio.Task, WorkflowNode] = {}
+        try:
+            while True:
+                while self._ready:
+                    _, _, nid = heapq.heappop(self._ready)
+                    node = self._nodes[nid]
+                    node.status = NodeStatus.RUNNING
+                    in_flight[self._start_task(self._run_node(node, ctx, results))] = node
+                if not in_flight:
                     break
-                await asyncio.sleep(0.05)
-                continue
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                failed = False
+                for task in done:
+                    node = in_flight.pop(task)
+                    self._release(node)
+                    failed = failed or node.status == NodeStatus.FAILED
+                if failed and self._fail_fast:
+                    await self._abort(in_flight)
+        finally:
+            # Never leave handlers running behind a cancelled execute()
+            if in_flight:
+                await self._abort(in_flight)
 
-            tasks = []
-            for node in ready:
-                node.status = NodeStatus.RUNNING
-                tasks.append(self._run_node(node, ctx, results))
+        return results
 
-            await asyncio.gather(*tasks)
+    async def _abort(self, in_flight: dict[asyncio.Task, WorkflowNode]) -> None:
+        """Cancel running nodes and skip everything not yet started."""
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        in_flight.clear()
+        for nid in self._remaining:
+            node = self._nodes[nid]
+            if node.status in (NodeStatus.PENDING, NodeStatus.RUNNING):
+                node.status = NodeStatus.SKIPPED
+        self._remaining.clear()
+        self._ready.clear()
 
-        return results
+    @staticmethod
+    def _start_task(coro) -> asyncio.Task:
+        if _EAGER_TASKS:
+            return asyncio.Task(coro, loop=asyncio.get_running_loop(), eager_start=True)
+        return asyncio.create_task(coro)
 
     async def _run_node(
         self, node: WorkflowNode, context: dict[str, Any], results: dict[str, Any]
     ) -> None:
         try:
-            dep_results = {d: results.get(d) for d in node.depends_on}
-            node.result = await node.handler(context=context, dep_results=dep_results, **node.metadata)
+            dep_ids = self._dep_ids.get(node.id, ())
+            dep_results = {d: results.get(d) for d in dep_ids} if dep_ids else _EMPTY_MAP
+            key = self._cache_key(node, context, dep_results) if node.cacheable else None
+            if key is not None and key in self._cache:
+                self._cache.move_to_end(key)
+                node.result = self._cache[key]
+                node.cached = True
+            else:
+                sem = self._semaphore_for(node)
+                async with sem if sem is not None else contextlib.nullcontext():
+                    node.result = await node.handler(context=context, dep_results=dep_results, **node.metadata)
+                node.cached = False
+                if key is not None:
+                    self._cache[key] = node.result
+                    if len(self._cache) > self._cache_size:
+                        self._cache.popitem(last=False)
             node.status = NodeStatus.COMPLETED
             results[node.id] = node.result
-            for cb in self._on_node_complete:
-                try:
-                    await cb(node)
-                except Exception:
-                    pass
+        except asyncio.CancelledError:
+            node.status = NodeStatus.SKIPPED
+            raise
         except Exception as e:
             node.status = NodeStatus.FAILED
             node.error = str(e)
-            logger.error(f"Workflow node '{node.id}' failed: {e}")
+            logger.error("Workflow node %r failed: %s", node.id, e)
+            return
+        # Outside the try: a failing callback must not re-label a completed node
+        if self._on_node_complete:
+            await self._notify_complete(node)
+
+    async def _notify_complete(self, node: WorkflowNode) -> None:
+        """Run the completion callbacks; sync ones are called, async ones gathered."""
+        pending: list[tuple[Callable, Awaitable]] = []
+        for cb in self._on_node_complete:
+            try:
+                outcome = cb(node)
+            except Exception as e:
+                logger.warning("Workflow callback %r failed for node %r: %s", cb, node.id, e)
+                continue
+            if inspect.isawaitable(outcome):
+                pending.append((cb, outcome))
+        if not pending:
+            return
+        outcomes = await asyncio.gather(*(aw for _, aw in pending), return_exceptions=True)
+        for (cb, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(
+                    "Workflow callback %r failed for node %r: %r", cb, node.id, outcome
+                )
+
+    @staticmethod
+    def _cache_key(
+        node: WorkflowNode, context: dict[str, Any], dep_results: Mapping[str, Any]
+    ) -> tuple[Callable, bytes] | None:
+        """The handler plus a BLAKE2b digest of the inputs that determine its result.
+
+        The handler object itself is part of the key: closures from one factory
+        share a qualname but not their captured values. Holding it in the key
+        also keeps it alive, so its identity cannot be reused by a later handler.
+        Returns None (no caching) when the inputs are not JSON-serializable.
+        """
+        try:
+            hash(node.handler)  # must be usable as a dict key
+            payload = _canonical([
+                dict(dep_results),
+                node.metadata,
+                {k: context.get(k) for k in node.cache_context_keys},
+            ])
+        except (TypeError, ValueError, AttributeError):
+            return None
+        return node.handler, hashlib.blake2b(payload, digest_size=16).digest()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
 
     def reset(self) -> None:
         for node in self._nodes.values():
             node.status = NodeStatus.PENDING
             node.result = None
             node.error = None
+            node.cached = False
 
     def get_status(self) -> dict[str, str]:
         return {nid: node.status.value for nid, node in self._nodes.items()}
@@ -32,6 +32,18 @@ def create_nexus_agent(system_prompt: str) -> genai.GenerativeModel:
     )
 
 
+# Agents are built once per role; re-creating a GenerativeModel on every call
+# re-processes the system prompt for nothing
+_agents: dict[str, genai.GenerativeModel] = {}
+
+
+def _agent(name: str, system_prompt: str) -> genai.GenerativeModel:
+    agent = _agents.get(name)
+    if agent is None:
+        agent = _agents.setdefault(name, create_nexus_agent(system_prompt))
+    return agent
+
+
 # ── Example: Translator Agent (mirrors nexus/skills/builtin/translator.py) ──
 
 TRANSLATOR_SYSTEM = (
@@ -44,8 +56,9 @@ TRANSLATOR_SYSTEM = (
 
 async def translate(text: str) -> str:
     """Translate text using Gemini via Google GenAI SDK."""
-    model = create_nexus_agent(TRANSLATOR_SYSTEM)
-    response = await asyncio.to_thread(model.generate_content, text)
+    model = _agent("translator", TRANSLATOR_SYSTEM)
+    # Native async call — no worker thread per request
+    response = await model.generate_content_async(text)
     return response.text
 
 
@@ -60,8 +73,8 @@ REASONING_SYSTEM = (
 
 async def reason(question: str) -> str:
     """Reason through a problem using Gemini via Google GenAI SDK."""
-    model = create_nexus_agent(REASONING_SYSTEM)
-    response = await asyncio.to_thread(model.generate_content, question)
+    model = _agent("reasoner", REASONING_SYSTEM)
+    response = await model.generate_content_async(question)
     return response.text
 
 
@@ -29,6 +29,23 @@ VERTEX_FLASH_MODEL = f"vertex_ai/gemini-2.0-flash"
 VERTEX_PRO_MODEL   = f"vertex_ai/gemini-1.5-pro"
 
 
+# ── Shared HTTP connection pool ──────────────────────────────────────────────
+
+_http_client = None
+
+
+def _shared_http_client():
+    """One pooled httpx.AsyncClient for every Vertex call (keep-alive reuse)."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+            timeout=60,
+        )
+    return _http_client
+
+
 # ── LiteLLM Vertex AI Example ────────────────────────────────────────────────
 
 async def call_vertex_gemini(prompt: str, model: str = VERTEX_FLASH_MODEL) -> str:
@@ -44,6 +61,8 @@ async def call_vertex_gemini(prompt: str, model: str = VERTEX_FLASH_MODEL) -> st
     """
     import litellm
 
+    if litellm.aclient_session is None:
+        litellm.aclient_session = _shared_http_client()
     response = await litellm.acompletion(
         model=model,
         messages=[{"role": "user", "content": prompt}],
@@ -2,86 +2,165 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+import json
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 from typing import Any
 
 from nexus.gateway.hub import ChannelMessage, MessageHub
 from nexus.security.auth import require_auth
 
-router = APIRouter(prefix="/api/v1", tags=["api"])
-_hub: MessageHub | None = None
-_memory: Any = None   # injected by init_api_channel / set_memory()
-_rate_limiter: Any = None  # injected by init_api_channel
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _ResponseClass
+    _dumps = orjson.dumps
+except ImportError:  # optional speedup
+    _ResponseClass = JSONResponse
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode()
+
+router = APIRouter(prefix="/api/v1", tags=["api"], default_response_class=_ResponseClass)
+
+
+class ChatBody(BaseModel):
+    content: str = ""
+    session_id: str = "default"
+    user_id: str = "api_user"
+
+
+class TeachBody(BaseModel):
+    title: str = "User-taught fact"
+    content: str = ""
+    category: str = "user_taught"
+
+
+class _ApiState:
+    """Singletons injected at startup and handed to handlers via Depends."""
+    hub: MessageHub | None = None
+    memory: Any = None        # injected by init_api_channel / set_memory()
+    rate_limiter: Any = None  # injected by init_api_channel / set_rate_limiter()
+
+
+_state = _ApiState()
+
+
+def get_hub() -> MessageHub | None:
+    return _state.hub
+
+
+def get_memory() -> Any:
+    return _state.memory
+
+
+def get_rate_limiter() -> Any:
+    return _state.rate_limiter
 
 
 def init_api_channel(hub: MessageHub, memory: Any = None, rate_limiter: Any = None) -> APIRouter:
-    global _hub, _memory, _rate_limiter
-    _hub = hub
-    _memory = memory
-    _rate_limiter = rate_limiter
+    _state.hub = hub
+    _state.memory = memory
+    _state.rate_limiter = rate_limiter
     hub.register_channel("api", router)
     return router
 
 
 def set_memory(memory: Any) -> None:
     """Update memory reference after deferred initialization."""
-    global _memory
-    _memory = memory
-
-
-@router.post("/chat")
-async def chat(request: Request) -> dict[str, Any]:
-    require_auth(request)
-    if _rate_limiter:
-        allowed, remaining = _rate_limiter.check("api_v1")
-        if not allowed:
-            return JSONResponse(
-                status_code=429,
-                content={"error": "Rate limit exceeded. Try again in 60 seconds."},
-                headers={
-                    "X-RateLimit-Limit": str(_rate_limiter.max_per_minute),
-                    "X-RateLimit-Remaining": "0",
-                    "Retry-After": "60",
-                },
-            )
-    body = await request.json()
+    _state.memory = memory
+
+
+def set_rate_limiter(rate_limiter: Any) -> None:
+    """Update rate limiter reference once the app lifespan has created it."""
+    _state.rate_limiter = rate_limiter
+
+
+def _over_limit(limiter: Any, key: str = "api_v1") -> JSONResponse | None:
+    """429 response if the shared API bucket is empty, else None.
+
+    Called from the handlers, which FastAPI only reaches after require_auth
+    has passed, so unauthenticated requests never spend the bucket.
+    """
+    if limiter is None:
+        return None
+    allowed, _ = limiter.check(key)
+    if allowed:
+        return None
+    return _ResponseClass(
+        status_code=429,
+        content={"error": "Rate limit exceeded. Try again in 60 seconds."},
+        headers={
+            "X-RateLimit-Limit": str(limiter.max_per_minute),
+            "X-RateLimit-Remaining": "0",
+            "Retry-After": "60",
+        },
+    )
+
+
+@router.post("/chat", dependencies=[Depends(require_auth)])
+async def chat(
+    body: ChatBody,
+    hub: MessageHub = Depends(get_hub),
+    limiter: Any = Depends(get_rate_limiter),
+) -> dict[str, Any]:
+    if (limited := _over_limit(limiter)) is not None:
+        return limited
     message = ChannelMessage(
         channel="api",
-        content=body.get("content", ""),
-        session_id=body.get("session_id", "default"),
-        user_id=body.get("user_id", "api_user"),
+        content=body.content,
+        session_id=body.session_id,
+        user_id=body.user_id,
     )
-    response = await _hub.process(message)
+    response = await hub.process(message)
     return {
         "answer": response.content,
         "events": response.events,
-        "metadata": response.metadata,
+        "metadata": response.metadata or {},
     }
 
 
+@router.post("/chat/stream", dependencies=[Depends(require_auth)])
+async def chat_stream(
+    body: ChatBody,
+    hub: MessageHub = Depends(get_hub),
+    limiter: Any = Depends(get_rate_limiter),
+):
+    """Like /chat, but streams each event as one NDJSON line as it happens."""
+    if (limited := _over_limit(limiter)) is not None:
+        return limited
+    message = ChannelMessage(
+        channel="api",
+        content=body.content,
+        session_id=body.session_id,
+        user_id=body.user_id,
+    )
+    return StreamingResponse(
+        (_dumps(event) + b"\n" async for event in hub.stream(message)),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get("/status")
 async def status() -> dict[str, str]:
     return {"status": "running", "channel": "api"}
 
 
-@router.post("/teach")
-async def teach(request: Request) -> dict[str, str]:
+@router.post("/teach", dependencies=[Depends(require_auth)])
+async def teach(body: TeachBody, memory: Any = Depends(get_memory)) -> dict[str, str]:
     """Teach the system a new fact and store it in long-term memory."""
-    require_auth(request)
-    body = await request.json()
-    title = body.get("title", "User-taught fact")
-    content = body.get("content", "")
-    category = body.get("category", "user_taught")
+    title = body.title
+    content = body.content
+    category = body.category
 
     if not content:
         return {"status": "error", "message": "Content is required"}
 
-    if _memory is None:
+    if memory is None:
         return {"status": "error", "message": "Memory system not available"}
 
     try:
-        await _memory.store_knowledge(
+        await memory.store_knowledge(
             title=title,
             content=content,
             category=category,
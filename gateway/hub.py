@@ -5,27 +5,37 @@ from __future__ import annotations
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Callable, Awaitable
+from typing import Any, AsyncIterator, Callable, Awaitable
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelMessage:
     """A message from any channel (web, telegram, api)."""
     channel: str  # "web", "telegram", "api"
     content: str
     session_id: str = "default"
     user_id: str = ""
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None  # allocated on first metadata_dict()
 
+    def metadata_dict(self) -> dict[str, Any]:
+        if self.metadata is None:
+            self.metadata = {}
+        return self.metadata
 
-@dataclass
+
+@dataclass(slots=True)
 class HubResponse:
     """Response from the hub to be sent back to the channel."""
     content: str
     events: list[dict[str, Any]] = field(default_factory=list)
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] | None = None  # allocated on first metadata_dict()
+
+    def metadata_dict(self) -> dict[str, Any]:
+        if self.metadata is None:
+            self.metadata = {}
+        return self.metadata
 
 
 class MessageHub:
@@ -36,45 +46,67 @@ class MessageHub:
         self._orchestrator = None
         self._channels: dict[str, Any] = {}
         self._middleware: list[Callable] = []
+        self._pipeline: Callable[[ChannelMessage], Awaitable[ChannelMessage]] | None = None
 
     def set_orchestrator(self, orchestrator) -> None:
         self._orchestrator = orchestrator
 
     def register_channel(self, name: str, channel: Any) -> None:
         self._channels[name] = channel
-        logger.info(f"Registered channel: {name}")
+        logger.info("Registered channel: %s", name)
 
     def add_middleware(self, middleware: Callable) -> None:
         self._middleware.append(middleware)
-
-    async def process(self, message: ChannelMessage) -> HubResponse:
-        """Process a message from any channel through the orchestrator."""
-        # Apply middleware
-        for mw in self._middleware:
-            try:
-                message = await mw(message)
-            except Exception as e:
-                logger.warning(f"Middleware error: {e}")
+        self._pipeline = self._compose(tuple(self._middleware))
+
+    @staticmethod
+    def _compose(chain: tuple[Callable, ...]) -> Callable[[ChannelMessage], Awaitable[ChannelMessage]]:
+        """Fold the middleware list into one coroutine, built once per registration."""
+        async def pipeline(message: ChannelMessage) -> ChannelMessage:
+            for mw in chain:
+                try:
+                    message = await mw(message)
+                except Exception as e:
+                    logger.warning("Middleware error: %s", e)
+            return message
+        return pipeline
+
+    async def stream(self, message: ChannelMessage) -> AsyncIterator[dict[str, Any]]:
+        """Yield orchestrator events for a message as soon as they are produced."""
+        if self._pipeline is not None:
+            message = await self._pipeline(message)
 
         if not self._orchestrator:
-            return HubResponse(content="System not initialized.")
-
-        events = []
-        final_answer = ""
+            yield {"type": "final_answer", "stream": "hub", "content": "System not initialized."}
+            return
 
         try:
             async for event in self._orchestrator.process(
                 message.content, message.session_id
             ):
-                events.append({
+                yield {
                     "type": event.event_type,
                     "stream": event.stream,
                     "content": event.content,
-                })
-                if event.event_type == "final_answer":
-                    final_answer = event.content
+                }
         except Exception as e:
-            logger.error(f"Hub processing error: {e}")
-            final_answer = f"Error processing your request: {e}"
+            logger.error("Hub processing error: %s", e)
+            yield {
+                "type": "final_answer",
+                "stream": "hub",
+                "content": f"Error processing your request: {e}",
+            }
+
+    async def process(self, message: ChannelMessage) -> HubResponse:
+        """Process a message from any channel and collect the full response."""
+        events = []
+        final_answer = ""
+        async for event in self.stream(message):
+            if event["stream"] == "hub":  # not initialized, or failed mid-stream
+                final_answer = event["content"]
+                continue
+            events.append(event)
+            if event["type"] == "final_answer":
+                final_answer = event["content"]
 
         return HubResponse(content=final_answer, events=events)
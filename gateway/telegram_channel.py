@@ -3,14 +3,96 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import os
-from typing import Any
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
 
 from nexus import config
 
+if TYPE_CHECKING:
+    from telegram import Update
+    from telegram.ext import ContextTypes
+
 logger = logging.getLogger(__name__)
 
+# Uploaded text files are injected into the prompt up to this many characters
+_TEXT_PREVIEW_CHARS = 6000
+# Text uploads up to this size are downloaded into memory instead of to disk
+_INLINE_TEXT_BYTES = 32 * 1024
+# /budget progress bars, one per fill level
+_BAR_LEN = 20
+_BUDGET_BARS = tuple("█" * i + "░" * (_BAR_LEN - i) for i in range(_BAR_LEN + 1))
+_BUDGET_TMPL = (
+    "📊 *Token 預算*\n\n"
+    "`[{bar}]` {pct:.1f}%\n\n"
+    "已用: {used:,}\n"
+    "上限: {limit:,}\n"
+    "剩餘: {remain:,}"
+)
+# Downloaded photos are kept (keyed by file_unique_id) for this long
+_PHOTO_CACHE_TTL_S = 3600
+
+
+async def _final_answer(events) -> str:
+    """Drain an orchestrator event stream and return its final answer."""
+    final_answer = ""
+    count = 0
+    async for event in events:
+        if event.event_type == "final_answer":
+            final_answer = event.content
+        count += 1
+        if count & 15 == 0:
+            await asyncio.sleep(0)  # let polling and other chats run during long streams
+    return final_answer
+
+
+def _guarded(handler):
+    """Only let whitelisted chats through, and only once the orchestrator is wired."""
+    @functools.wraps(handler)
+    async def wrapper(self: TelegramChannel, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        if not update.message:
+            return
+        chat_id = update.effective_chat.id
+        if not self._is_user_allowed(chat_id):
+            await update.message.reply_text("⛔ 未授權的用戶。請聯繫管理員。")
+            logger.warning("Unauthorized Telegram user: %s", chat_id)
+            return
+        if not self._orchestrator:
+            await update.message.reply_text("⏳ 系統尚未就緒，請稍後再試。")
+            return
+        await handler(self, update, ctx)
+    return wrapper
+
+
+def _prune_photos(upload_dir: Path, max_age_s: float = _PHOTO_CACHE_TTL_S) -> None:
+    cutoff = time.time() - max_age_s
+    # Documents keep their own suffix (.png, .webp, ...), so match them all
+    for path in upload_dir.glob("photo_*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _touch_if_exists(path: Path) -> bool:
+    """Refresh mtime so the pruner keeps a photo that is being reused."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _read_head(path: Path, max_chars: int = _TEXT_PREVIEW_CHARS) -> str:
+    """Decode only the start of a file; UTF-8 needs at most 4 bytes per char."""
+    with open(path, "rb") as f:
+        raw = f.read(max_chars * 4)
+    return raw.decode("utf-8", errors="replace")[:max_chars]
+
 
 class TelegramChannel:
     """Telegram bot integration for mobile access.
@@ -19,6 +101,9 @@ class TelegramChannel:
     1. Talk to @BotFather on Telegram, send /newbot
     2. Copy the token to .env as TELEGRAM_BOT_TOKEN
     3. Start Nexus, the bot will automatically begin polling
+
+    Updates are fetched with long polling (gateway.telegram.poll_timeout,
+    default 30s); previously the library's short 10s default was used.
     """
 
     def __init__(self) -> None:
@@ -27,20 +112,26 @@ class TelegramChannel:
         self._budget = None
         self._app = None
         self._running = False
+        self._upload_dir = Path(__file__).parent.parent / "data" / "tg_uploads"
+        self._last_photo_prune = float("-inf")
+        self._bg_tasks: set[asyncio.Task] = set()
         # Build whitelist: always include owner (TELEGRAM_CHAT_ID),
         # plus any extra IDs from TELEGRAM_ALLOWED_USERS.
-        self._allowed_users: set[int] = set()
+        allowed: set[int] = set()
         owner_id = os.getenv("TELEGRAM_CHAT_ID", "").strip().lstrip("-")
         if owner_id.isdigit():
-            self._allowed_users.add(int(owner_id))
+            allowed.add(int(owner_id))
         extra = os.getenv("TELEGRAM_ALLOWED_USERS", "").strip()
         if extra:
             for uid in extra.split(","):
                 uid = uid.strip().lstrip("-")
                 if uid.isdigit():
-                    self._allowed_users.add(int(uid))
-        if self._allowed_users:
-            logger.info(f"Telegram whitelist: {self._allowed_users}")
+                    allowed.add(int(uid))
+        # Fixed for the lifetime of the channel; checked on every update
+        self._allowed_users: frozenset[int] = frozenset(allowed)
+        self._deny_all = not self._allowed_users
+        if not self._deny_all:
+            logger.info(f"Telegram whitelist: {set(self._allowed_users)}")
         else:
             logger.warning(
                 "Telegram: no whitelist configured "
@@ -50,9 +141,8 @@ class TelegramChannel:
 
     def _is_user_allowed(self, chat_id: int) -> bool:
         """Check if chat_id is whitelisted. Defaults to deny-all for safety."""
-        if not self._allowed_users:
-            return False  # no whitelist → deny everyone
-        return chat_id in self._allowed_users
+        # no whitelist → deny everyone
+        return not self._deny_all and chat_id in self._allowed_users
 
     def set_orchestrator(self, orchestrator) -> None:
         self._orchestrator = orchestrator
@@ -78,13 +168,12 @@ class TelegramChannel:
             return
 
         try:
-            from telegram import Update, BotCommand
+            from telegram import BotCommand
             from telegram.ext import (
                 ApplicationBuilder,
                 CommandHandler,
                 MessageHandler,
                 filters,
-                ContextTypes,
             )
         except ImportError:
             logger.error(
@@ -96,329 +185,337 @@ class TelegramChannel:
         # Build bot application
         self._app = ApplicationBuilder().token(token).build()
 
-        # ── Command handlers ──
-        async def cmd_start(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            await update.message.reply_text(
-                "🧠 *Nexus AI* 已上線！\n\n"
-                "直接傳送訊息即可對話。\n\n"
-                "指令:\n"
-                "/status - 查看系統狀態\n"
-                "/reset - 重置對話\n"
-                "/budget - 查看 token 預算\n"
-                "/help - 說明",
-                parse_mode="Markdown",
-            )
+        await asyncio.to_thread(self._upload_dir.mkdir, parents=True, exist_ok=True)
 
-        async def cmd_help(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            await update.message.reply_text(
-                "🧠 *Nexus AI 說明*\n\n"
-                "*對話方式：*\n"
-                "• 直接打字對話\n"
-                "• 傳送📷圖片 → 自動分析（OCR/描述）\n"
-                "• 傳送📄PDF → 自動提取文字\n"
-                "• 傳送📝文字檔 → 自動讀取內容\n"
-                "• 圖片/文件 + 說明文字 → 針對性分析\n\n"
-                "*系統功能：*\n"
-                "• 多路徑推理 + 自我驗證\n"
-                "• 4 層記憶系統\n"
-                "• 新聞、天氣、提醒、排程等技能\n"
-                "• Token 預算控制\n\n"
-                "*指令：* /status /budget /reset /help",
-                parse_mode="Markdown",
+        # Register handlers; the table order is also the bot's command menu order
+        commands = (
+            ("start", "啟動 Nexus AI", self.cmd_start),
+            ("status", "系統狀態", self.cmd_status),
+            ("budget", "Token 預算", self.cmd_budget),
+            ("reset", "重置對話", self.cmd_reset),
+            ("chatid", "查詢我的 Chat ID", self.cmd_chatid),
+            ("help", "使用說明", self.cmd_help),
+        )
+        for name, _, handler in commands:
+            self._app.add_handler(CommandHandler(name, handler))
+        self._app.add_handler(
+            MessageHandler(filters.PHOTO | filters.Document.IMAGE, self.handle_image)
+        )
+        self._app.add_handler(MessageHandler(filters.Document.ALL, self.handle_document))
+        self._app.add_handler(
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message)
+        )
+
+        # Set bot commands menu
+        try:
+            await self._app.bot.set_my_commands(
+                [BotCommand(name, label) for name, label, _ in commands]
             )
+        except Exception:
+            pass
+
+        self._running = True
+        logger.info("✅ Telegram bot started! Send a message to your bot.")
+
+        # Add error handler to suppress Conflict warnings on rapid restart
+        async def _on_error(update, ctx) -> None:
+            from telegram.error import Conflict
+            if isinstance(ctx.error, Conflict):
+                logger.warning("Telegram: Conflict detected (old instance still alive), will auto-recover in ~10s")
+                await asyncio.sleep(10)
+            else:
+                logger.warning("Telegram error: %s", ctx.error)
+
+        self._app.add_error_handler(_on_error)
 
-        async def cmd_status(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            parts = ["📊 *系統狀態*\n"]
-            if self._budget:
-                s = self._budget.get_status()
-                pct = (1 - s["usage_ratio"]) * 100
-                parts.append(f"💰 Token: {s['tokens_used']:,} / {s['daily_limit']:,}")
-                parts.append(f"🔋 剩餘: {pct:.1f}%")
-                parts.append(f"📨 今日請求: {s['request_count']}")
-                parts.append(f"🔬 好奇心剩餘: {s['curiosity_ops_remaining']}")
-            if self._memory:
-                parts.append(f"\n💾 工作記憶: {self._memory.working.size} slots")
-            await update.message.reply_text("\n".join(parts), parse_mode="Markdown")
-
-        async def cmd_budget(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            if not self._budget:
-                await update.message.reply_text("Budget controller not available.")
-                return
+        # Start polling (non-blocking); wait 5s first to let old instance disconnect
+        await self._app.initialize()
+        await self._app.start()
+        await asyncio.sleep(5)
+        # Long polling: Telegram holds getUpdates open until an update arrives
+        # (or poll_timeout passes), so an idle bot is not hammering the API
+        await self._app.updater.start_polling(
+            drop_pending_updates=True,
+            allowed_updates=["message", "callback_query"],
+            timeout=int(config.get("gateway.telegram.poll_timeout", 30)),
+            poll_interval=0.0,
+            bootstrap_retries=-1,
+        )
+
+    # ── Command handlers ──
+    async def cmd_start(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.message.reply_text(
+            "🧠 *Nexus AI* 已上線！\n\n"
+            "直接傳送訊息即可對話。\n\n"
+            "指令:\n"
+            "/status - 查看系統狀態\n"
+            "/reset - 重置對話\n"
+            "/budget - 查看 token 預算\n"
+            "/help - 說明",
+            parse_mode="Markdown",
+        )
+
+    async def cmd_help(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.message.reply_text(
+            "🧠 *Nexus AI 說明*\n\n"
+            "*對話方式：*\n"
+            "• 直接打字對話\n"
+            "• 傳送📷圖片 → 自動分析（OCR/描述）\n"
+            "• 傳送📄PDF → 自動提取文字\n"
+            "• 傳送📝文字檔 → 自動讀取內容\n"
+            "• 圖片/文件 + 說明文字 → 針對性分析\n\n"
+            "*系統功能：*\n"
+            "• 多路徑推理 + 自我驗證\n"
+            "• 4 層記憶系統\n"
+            "• 新聞、天氣、提醒、排程等技能\n"
+            "• Token 預算控制\n\n"
+            "*指令：* /status /budget /reset /help",
+            parse_mode="Markdown",
+        )
+
+    async def cmd_status(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        parts = ["📊 *系統狀態*\n"]
+        if self._budget:
             s = self._budget.get_status()
-            bar_len = 20
-            filled = int(s["usage_ratio"] * bar_len)
-            bar = "█" * filled + "░" * (bar_len - filled)
-            await update.message.reply_text(
-                f"📊 *Token 預算*\n\n"
-                f"`[{bar}]` {s['usage_ratio']*100:.1f}%\n\n"
-                f"已用: {s['tokens_used']:,}\n"
-                f"上限: {s['daily_limit']:,}\n"
-                f"剩餘: {s['tokens_remaining']:,}",
-                parse_mode="Markdown",
-            )
+            pct = (1 - s["usage_ratio"]) * 100
+            parts.append(f"💰 Token: {s['tokens_used']:,} / {s['daily_limit']:,}")
+            parts.append(f"🔋 剩餘: {pct:.1f}%")
+            parts.append(f"📨 今日請求: {s['request_count']}")
+            parts.append(f"🔬 好奇心剩餘: {s['curiosity_ops_remaining']}")
+        if self._memory:
+            parts.append(f"\n💾 工作記憶: {self._memory.working.size} slots")
+        await update.message.reply_text("\n".join(parts), parse_mode="Markdown")
+
+    async def cmd_budget(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        if not self._budget:
+            await update.message.reply_text("Budget controller not available.")
+            return
+        s = self._budget.get_status()
+        filled = min(max(int(s["usage_ratio"] * _BAR_LEN), 0), _BAR_LEN)
+        await update.message.reply_text(
+            _BUDGET_TMPL.format(
+                bar=_BUDGET_BARS[filled], pct=s["usage_ratio"] * 100,
+                used=s["tokens_used"], limit=s["daily_limit"], remain=s["tokens_remaining"],
+            ),
+            parse_mode="Markdown",
+        )
 
-        async def cmd_reset(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            chat_id = update.effective_chat.id
-            session_id = f"tg_{chat_id}"
-            if self._memory:
-                await self._memory.session.clear_session(session_id)
-                self._memory.working.clear()
-            await update.message.reply_text("🔄 對話已重置。")
-
-        async def cmd_chatid(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            chat_id = update.effective_chat.id
-            await update.message.reply_text(
-                f"📋 你的 Chat ID 是：\n`{chat_id}`\n\n"
-                "請把這個數字填入 `.env` 的 `TELEGRAM_CHAT_ID=`",
-                parse_mode="Markdown",
-            )
+    async def cmd_reset(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        chat_id = update.effective_chat.id
+        session_id = f"tg_{chat_id}"
+        if self._memory:
+            await self._memory.session.clear_session(session_id)
+            self._memory.working.clear()
+        await update.message.reply_text("🔄 對話已重置。")
+
+    async def cmd_chatid(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        chat_id = update.effective_chat.id
+        await update.message.reply_text(
+            f"📋 你的 Chat ID 是：\n`{chat_id}`\n\n"
+            "請把這個數字填入 `.env` 的 `TELEGRAM_CHAT_ID=`",
+            parse_mode="Markdown",
+        )
 
-        # ── Message handler ──
-        async def handle_message(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            if not update.message or not update.message.text:
-                return
+    # ── Message handler ──
+    @_guarded
+    async def handle_message(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        if not update.message.text:
+            return
 
-            chat_id = update.effective_chat.id
-            if not self._is_user_allowed(chat_id):
-                await update.message.reply_text("⛔ 未授權的用戶。請聯繫管理員。")
-                logger.warning(f"Unauthorized Telegram user: {chat_id}")
-                return
+        chat_id = update.effective_chat.id
+        session_id = f"tg_{chat_id}"
+        user_text = update.message.text
 
-            if not self._orchestrator:
-                await update.message.reply_text("⏳ 系統尚未就緒，請稍後再試。")
-                return
+        logger.info("📩 Telegram message from %s: %.80s", chat_id, user_text)
 
-            chat_id = update.effective_chat.id
-            session_id = f"tg_{chat_id}"
-            user_text = update.message.text
+        # Send "typing" indicator
+        await update.message.chat.send_action("typing")
 
-            logger.info(f"📩 Telegram message from {chat_id}: {user_text[:80]}")
+        # Process through orchestrator
+        final_answer = ""
 
-            # Send "typing" indicator
-            await update.message.chat.send_action("typing")
+        try:
+            logger.info("Starting orchestrator.process()...")
+            count = 0
+            async for event in self._orchestrator.process(user_text, session_id):
+                logger.info("Event: %s | %.100s", event.event_type, event.content or "(empty)")
+                # Keep draining after final_answer: the orchestrator saves the
+                # session and budget only once the consumer resumes it
+                if event.event_type == "final_answer":
+                    final_answer = event.content
+                count += 1
+                if count & 15 == 0:
+                    await asyncio.sleep(0)
+            logger.info("Orchestrator done. Answer length: %d", len(final_answer))
+        except Exception as e:
+            logger.error("Telegram processing error: %s", e, exc_info=True)
+            final_answer = f"❌ 處理錯誤: {e}"
 
-            # Process through orchestrator
-            final_answer = ""
-            thinking_parts = []
+        if not final_answer:
+            final_answer = "（沒有生成回應）"
 
+        # Send response (split if too long for Telegram's 4096 char limit)
+        logger.info("Sending reply to Telegram (%d chars)...", len(final_answer))
+        for chunk in self._split_message(final_answer, 4000):
             try:
-                logger.info("Starting orchestrator.process()...")
-                async for event in self._orchestrator.process(user_text, session_id):
-                    logger.info(f"Event: {event.event_type} | {event.content[:100] if event.content else '(empty)'}")
-                    if event.event_type == "final_answer":
-                        final_answer = event.content
-                    elif event.event_type in ("hypothesis", "selected", "verified"):
-                        thinking_parts.append(event.content)
-                logger.info(f"Orchestrator done. Answer length: {len(final_answer)}")
+                await update.message.reply_text(chunk)
+                logger.info("✅ Reply sent successfully")
             except Exception as e:
-                logger.error(f"Telegram processing error: {e}", exc_info=True)
-                final_answer = f"❌ 處理錯誤: {e}"
+                logger.error("Telegram send error: %s", e, exc_info=True)
+
+    # ── Image handler (photos and image documents) ──
+    @_guarded
+    async def handle_image(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        msg = update.message
+        if msg.photo:
+            # Highest-resolution size of a compressed photo
+            await self._analyze_image(update, msg.photo[-1], ".jpg")
+        elif msg.document:
+            suffix = Path(msg.document.file_name or "").suffix.lower() or ".jpg"
+            await self._analyze_image(update, msg.document, suffix)
+
+    async def _analyze_image(self, update: Update, source: Any, suffix: str) -> None:
+        """Download (or reuse) an image and answer with the vision agent.
+
+        source is a PhotoSize or Document; its file_unique_id is stable for
+        the same image, so a re-sent image is served from the earlier download.
+        """
+        chat_id = update.effective_chat.id
+        caption = update.message.caption or "請描述這張圖片的內容。"
+        session_id = f"tg_{chat_id}"
+        await update.message.chat.send_action("typing")
+
+        img_path = self._upload_dir / f"photo_{source.file_unique_id}{suffix}"
+        if await asyncio.to_thread(_touch_if_exists, img_path):
+            logger.info("Photo reused: %s", img_path)
+        else:
+            tg_file = await source.get_file()
+            await tg_file.download_to_drive(str(img_path))
+            logger.info("Photo saved: %s", img_path)
+        self._schedule_photo_prune()
 
-            if not final_answer:
-                final_answer = "（沒有生成回應）"
+        final_answer = ""
+        try:
+            final_answer = await _final_answer(self._orchestrator.process(
+                caption, session_id,
+                extra_context={"has_image": True, "image_path": str(img_path)},
+                force_agent="vision",
+            ))
+        except Exception as e:
+            logger.error("Photo processing error: %s", e, exc_info=True)
+            final_answer = f"❌ 圖片分析失敗: {e}"
 
-            # Send response (split if too long for Telegram's 4096 char limit)
-            logger.info(f"Sending reply to Telegram ({len(final_answer)} chars)...")
-            for chunk in self._split_message(final_answer, 4000):
-                try:
-                    await update.message.reply_text(chunk)
-                    logger.info("✅ Reply sent successfully")
-                except Exception as e:
-                    logger.error(f"Telegram send error: {e}", exc_info=True)
-
-        # ── Photo handler ──
-        async def handle_photo(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            if not update.message:
-                return
-            chat_id = update.effective_chat.id
-            if not self._is_user_allowed(chat_id):
-                await update.message.reply_text("⛔ 未授權的用戶。")
-                return
-            if not self._orchestrator:
-                await update.message.reply_text("⏳ 系統尚未就緒，請稍後再試。")
-                return
-
-            caption = update.message.caption or "請描述這張圖片的內容。"
-            session_id = f"tg_{chat_id}"
-            await update.message.chat.send_action("typing")
-
-            import time as _time
-            from pathlib import Path as _Path
-
-            upload_dir = _Path(__file__).parent.parent / "data" / "tg_uploads"
-            upload_dir.mkdir(parents=True, exist_ok=True)
-
-            # Download highest-resolution photo
-            photo = update.message.photo[-1]
-            tg_file = await photo.get_file()
-            img_path = upload_dir / f"photo_{int(_time.time())}_{photo.file_id[-8:]}.jpg"
-            await tg_file.download_to_drive(str(img_path))
-            logger.info(f"Photo saved: {img_path}")
+        for chunk in self._split_message(final_answer or "（無法分析圖片）", 4000):
+            await update.message.reply_text(chunk)
 
-            final_answer = ""
-            try:
-                async for event in self._orchestrator.process(
-                    caption, session_id,
-                    extra_context={"has_image": True, "image_path": str(img_path)},
-                    force_agent="vision",
-                ):
-                    if event.event_type == "final_answer":
-                        final_answer = event.content
-            except Exception as e:
-                logger.error(f"Photo processing error: {e}", exc_info=True)
-                final_answer = f"❌ 圖片分析失敗: {e}"
-            finally:
-                try:
-                    img_path.unlink(missing_ok=True)
-                except Exception:
-                    pass
+    def _schedule_photo_prune(self) -> None:
+        """Expire cached photos in the background, at most once per prune interval."""
+        now = time.monotonic()
+        if now - self._last_photo_prune < _PHOTO_CACHE_TTL_S:
+            return
+        self._last_photo_prune = now
+        task = asyncio.create_task(asyncio.to_thread(_prune_photos, self._upload_dir))
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+
+    # ── Document handler ──
+    @_guarded
+    async def handle_document(self, update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> None:
+        if not update.message.document:
+            return
+        chat_id = update.effective_chat.id
+        doc = update.message.document
+        file_name = doc.file_name or "file"
+        ext = Path(file_name).suffix.lower()
+        mime = doc.mime_type or ""
+
+        IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
+        TEXT_EXTS  = {".txt", ".md", ".csv", ".json", ".log", ".py",
+                      ".js", ".ts", ".html", ".css", ".xml", ".yaml", ".yml"}
+
+        if ext in IMAGE_EXTS:
+            # Image sent with a non-image MIME type (image/* goes to handle_image)
+            await self._analyze_image(update, doc, ext)
+            return
 
-            for chunk in self._split_message(final_answer or "（無法分析圖片）", 4000):
-                await update.message.reply_text(chunk)
+        caption = update.message.caption or ""
+        session_id = f"tg_{chat_id}"
+        await update.message.chat.send_action("typing")
 
-        # ── Document handler ──
-        async def handle_document(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-            if not update.message or not update.message.document:
-                return
-            chat_id = update.effective_chat.id
-            if not self._is_user_allowed(chat_id):
-                await update.message.reply_text("⛔ 未授權的用戶。")
-                return
-            if not self._orchestrator:
-                await update.message.reply_text("⏳ 系統尚未就緒，請稍後再試。")
-                return
-
-            doc = update.message.document
-            caption = update.message.caption or ""
-            session_id = f"tg_{chat_id}"
-            await update.message.chat.send_action("typing")
-
-            import time as _time
-            from pathlib import Path as _Path
-
-            upload_dir = _Path(__file__).parent.parent / "data" / "tg_uploads"
-            upload_dir.mkdir(parents=True, exist_ok=True)
-
-            file_name = doc.file_name or "file"
-            ext = _Path(file_name).suffix.lower()
-            mime = doc.mime_type or ""
-
-            IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"}
-            TEXT_EXTS  = {".txt", ".md", ".csv", ".json", ".log", ".py",
-                          ".js", ".ts", ".html", ".css", ".xml", ".yaml", ".yml"}
-
-            save_path = upload_dir / f"{int(_time.time())}_{file_name}"
-            tg_file = await doc.get_file()
-            await tg_file.download_to_drive(str(save_path))
-            logger.info(f"Document saved: {save_path} ({mime})")
-
-            final_answer = ""
-            try:
-                if mime.startswith("image/") or ext in IMAGE_EXTS:
-                    # ── Image document → Vision agent ──
-                    user_q = caption or "請描述這張圖片的內容。"
-                    async for event in self._orchestrator.process(
-                        user_q, session_id,
-                        extra_context={"has_image": True, "image_path": str(save_path)},
-                        force_agent="vision",
-                    ):
-                        if event.event_type == "final_answer":
-                            final_answer = event.content
-                    save_path.unlink(missing_ok=True)
-
-                elif mime == "application/pdf" or ext == ".pdf":
+        is_pdf = mime == "application/pdf" or ext == ".pdf"
+        is_text = not is_pdf and (mime.startswith("text/") or ext in TEXT_EXTS)
+
+        final_answer = ""
+        save_path: Path | None = None
+        try:
+            if is_text and doc.file_size and doc.file_size <= _INLINE_TEXT_BYTES:
+                # ── Small text file → decode in memory, never touches disk ──
+                tg_file = await doc.get_file()
+                raw = await tg_file.download_as_bytearray()
+                content = bytes(raw).decode("utf-8", errors="replace")[:_TEXT_PREVIEW_CHARS]
+                final_answer = await self._ask_about_text(file_name, content, caption, session_id)
+
+            elif is_pdf or is_text:
+                # Named from Telegram ids, no clock read. PDFs are kept, so the
+                # same PDF sent again reuses its file; text files are deleted
+                # after reading, so they also get the message id to stay unique
+                if is_pdf:
+                    save_path = self._upload_dir / f"{doc.file_unique_id}_{file_name}"
+                else:
+                    save_path = self._upload_dir / (
+                        f"{doc.file_unique_id}_{chat_id}_{update.message.message_id}_{file_name}"
+                    )
+                if is_pdf and await asyncio.to_thread(save_path.exists):
+                    logger.info("Document reused: %s", save_path)
+                else:
+                    tg_file = await doc.get_file()
+                    await tg_file.download_to_drive(str(save_path))
+                    logger.info("Document saved: %s (%s)", save_path, mime)
+
+                if is_pdf:
                     # ── PDF → pdf_reader skill ──
                     query = f"pdf {save_path}"
                     if caption:
                         query += f"\n{caption}"
-                    async for event in self._orchestrator.process(query, session_id):
-                        if event.event_type == "final_answer":
-                            final_answer = event.content
+                    final_answer = await _final_answer(self._orchestrator.process(query, session_id))
                     # Keep PDF for possible re-use; user can delete manually
 
-                elif mime.startswith("text/") or ext in TEXT_EXTS:
-                    # ── Text file → read and inject into prompt ──
+                else:
+                    # ── Large text file → read the head and inject into prompt ──
+                    # Disk I/O runs in a worker thread so other updates keep flowing
                     try:
-                        content = save_path.read_text(encoding="utf-8", errors="replace")[:6000]
+                        content = await asyncio.to_thread(_read_head, save_path)
                     except Exception:
                         content = "(無法讀取檔案內容)"
-                    save_path.unlink(missing_ok=True)
-                    query = f"【檔案：{file_name}】\n{content}"
-                    if caption:
-                        query = f"{caption}\n\n{query}"
-                    async for event in self._orchestrator.process(query, session_id):
-                        if event.event_type == "final_answer":
-                            final_answer = event.content
+                    await asyncio.to_thread(save_path.unlink, missing_ok=True)
+                    final_answer = await self._ask_about_text(file_name, content, caption, session_id)
 
-                else:
-                    save_path.unlink(missing_ok=True)
-                    final_answer = (
-                        f"⚠️ 不支援的檔案格式：`{ext or mime}`\n\n"
-                        "目前支援：\n"
-                        "• 📷 圖片（jpg/png/webp/gif）\n"
-                        "• 📄 PDF 文件\n"
-                        "• 📝 文字檔（txt/md/csv/json/py 等）"
-                    )
+            else:
+                final_answer = (
+                    f"⚠️ 不支援的檔案格式：`{ext or mime}`\n\n"
+                    "目前支援：\n"
+                    "• 📷 圖片（jpg/png/webp/gif）\n"
+                    "• 📄 PDF 文件\n"
+                    "• 📝 文字檔（txt/md/csv/json/py 等）"
+                )
 
-            except Exception as e:
-                logger.error(f"Document processing error: {e}", exc_info=True)
-                final_answer = f"❌ 檔案處理失敗: {e}"
+        except Exception as e:
+            logger.error("Document processing error: %s", e, exc_info=True)
+            final_answer = f"❌ 檔案處理失敗: {e}"
+            if save_path is not None:
                 try:
-                    save_path.unlink(missing_ok=True)
+                    await asyncio.to_thread(save_path.unlink, missing_ok=True)
                 except Exception:
                     pass
 
-            for chunk in self._split_message(final_answer or "（無法處理檔案）", 4000):
-                await update.message.reply_text(chunk)
+        for chunk in self._split_message(final_answer or "（無法處理檔案）", 4000):
+            await update.message.reply_text(chunk)
 
-        # Register handlers
-        self._app.add_handler(CommandHandler("start", cmd_start))
-        self._app.add_handler(CommandHandler("help", cmd_help))
-        self._app.add_handler(CommandHandler("status", cmd_status))
-        self._app.add_handler(CommandHandler("budget", cmd_budget))
-        self._app.add_handler(CommandHandler("reset", cmd_reset))
-        self._app.add_handler(CommandHandler("chatid", cmd_chatid))
-        self._app.add_handler(MessageHandler(filters.PHOTO, handle_photo))
-        self._app.add_handler(MessageHandler(filters.Document.ALL, handle_document))
-        self._app.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message)
-        )
-
-        # Set bot commands menu
-        try:
-            await self._app.bot.set_my_commands([
-                BotCommand("start", "啟動 Nexus AI"),
-                BotCommand("status", "系統狀態"),
-                BotCommand("budget", "Token 預算"),
-                BotCommand("reset", "重置對話"),
-                BotCommand("chatid", "查詢我的 Chat ID"),
-                BotCommand("help", "使用說明"),
-            ])
-        except Exception:
-            pass
-
-        self._running = True
-        logger.info("✅ Telegram bot started! Send a message to your bot.")
-
-        # Add error handler to suppress Conflict warnings on rapid restart
-        async def _on_error(update, ctx) -> None:
-            from telegram.error import Conflict
-            if isinstance(ctx.error, Conflict):
-                logger.warning("Telegram: Conflict detected (old instance still alive), will auto-recover in ~10s")
-                await asyncio.sleep(10)
-            else:
-                logger.warning("Telegram error: %s", ctx.error)
-
-        self._app.add_error_handler(_on_error)
-
-        # Start polling (non-blocking); wait 5s first to let old instance disconnect
-        await self._app.initialize()
-        await self._app.start()
-        await asyncio.sleep(5)
-        await self._app.updater.start_polling(
-            drop_pending_updates=True,
-            allowed_updates=["message", "callback_query"],
-        )
+    async def _ask_about_text(self, file_name: str, content: str, caption: str, session_id: str) -> str:
+        query = f"【檔案：{file_name}】\n{content}"
+        if caption:
+            query = f"{caption}\n\n{query}"
+        return await _final_answer(self._orchestrator.process(query, session_id))
 
     async def send_to_owner(self, text: str) -> bool:
         """Proactively send a message to the owner (e.g. morning report)."""
@@ -427,12 +524,15 @@ class TelegramChannel:
             logger.warning("send_to_owner: TELEGRAM_CHAT_ID not set or bot not started")
             return False
         try:
+            chat_id = int(chat_id_str)
+            # Sent one at a time on purpose: concurrent sends can reach
+            # Telegram out of order and scramble a multi-part report
             for chunk in self._split_message(text, 4000):
-                await self._app.bot.send_message(chat_id=int(chat_id_str), text=chunk)
+                await self._app.bot.send_message(chat_id=chat_id, text=chunk)
             logger.info("send_to_owner: message sent successfully")
             return True
         except Exception as e:
-            logger.error(f"send_to_owner failed: {e}")
+            logger.error("send_to_owner failed: %s", e)
             return False
 
     async def stop(self) -> None:
@@ -446,19 +546,26 @@ class TelegramChannel:
                 logger.warning(f"Telegram shutdown: {e}")
 
     @staticmethod
-    def _split_message(text: str, max_len: int = 4000) -> list[str]:
-        """Split long messages for Telegram's character limit."""
+    def _split_message(text: str, max_len: int = 4000) -> Iterator[str]:
+        """Split long messages for Telegram's character limit.
+
+        Yields chunks lazily so a long reply is sent as it is cut, without
+        holding every chunk at once.
+        """
         if len(text) <= max_len:
-            return [text]
-        chunks = []
-        while text:
-            if len(text) <= max_len:
-                chunks.append(text)
-                break
-            # Try to split at newline
-            split_at = text.rfind("\n", 0, max_len)
-            if split_at == -1:
-                split_at = max_len
-            chunks.append(text[:split_at])
-            text = text[split_at:].lstrip("\n")
-        return chunks
+            yield text
+            return
+        # Walk a cursor over the original string so each character is copied
+        # once, instead of re-slicing the remaining tail on every split
+        pos, n = 0, len(text)
+        while pos < n:
+            end = min(pos + max_len, n)
+            if end < n:
+                # Try to split at newline
+                nl = text.rfind("\n", pos, end)
+                if nl > pos:
+                    end = nl
+            yield text[pos:end]
+            pos = end
+            while pos < n and text[pos] == "\n":
+                pos += 1
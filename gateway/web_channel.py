@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from typing import Any
@@ -11,10 +12,24 @@ from fastapi.responses import HTMLResponse
 
 from nexus.gateway.hub import ChannelMessage, MessageHub
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads
+except ImportError:  # optional speedup
+    _dumps = json.dumps
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["web"])
 _hub: MessageHub | None = None
-_active_ws: list[WebSocket] = []
+_active_ws: set[WebSocket] = set()
+_BROADCAST_TIMEOUT_S = 2.0  # slow clients are dropped rather than stalling the others
+_CLOSE_TIMEOUT_S = 1.0
+_close_tasks: set[asyncio.Task] = set()
+_NOT_INITIALIZED_FRAME = _dumps({"type": "error", "content": "System not initialized"})
 
 
 def init_web_channel(hub: MessageHub) -> APIRouter:
@@ -27,13 +42,12 @@ def init_web_channel(hub: MessageHub) -> APIRouter:
 @router.websocket("/ws/chat")
 async def ws_chat(ws: WebSocket):
     await ws.accept()
-    _active_ws.append(ws)
+    _active_ws.add(ws)
     logger.info(f"Web WebSocket connected. Total: {len(_active_ws)}")
 
     try:
         while True:
-            data = await ws.receive_text()
-            msg = json.loads(data)
+            msg = _loads(await ws.receive_text())
 
             message = ChannelMessage(
                 channel="web",
@@ -48,37 +62,41 @@ async def ws_chat(ws: WebSocket):
                     async for event in _hub._orchestrator.process(
                         message.content, message.session_id
                     ):
-                        await ws.send_text(json.dumps({
-                            "type": event.event_type,
-                            "stream": event.stream,
-                            "content": event.content,
-                            "metadata": event.metadata,
-                        }))
+                        await ws.send_text(event.to_json())
                 except Exception as e:
-                    await ws.send_text(json.dumps({
+                    await ws.send_text(_dumps({
                         "type": "error",
                         "content": str(e),
                     }))
             else:
-                await ws.send_text(json.dumps({
-                    "type": "error",
-                    "content": "System not initialized",
-                }))
+                await ws.send_text(_NOT_INITIALIZED_FRAME)
 
     except WebSocketDisconnect:
-        if ws in _active_ws:
-            _active_ws.remove(ws)
+        _active_ws.discard(ws)
         logger.info(f"Web WebSocket disconnected. Total: {len(_active_ws)}")
 
 
 async def broadcast(event: dict[str, Any]) -> None:
     """Broadcast an event to all connected web clients."""
-    msg = json.dumps(event)
-    disconnected = []
-    for ws in _active_ws:
-        try:
-            await ws.send_text(msg)
-        except Exception:
-            disconnected.append(ws)
-    for ws in disconnected:
-        _active_ws.remove(ws)
+    if not _active_ws:
+        return
+    msg = _dumps(event)
+    sockets = list(_active_ws)  # snapshot: sockets may join/leave while awaiting
+    results = await asyncio.gather(
+        *(asyncio.wait_for(ws.send_text(msg), _BROADCAST_TIMEOUT_S) for ws in sockets),
+        return_exceptions=True,
+    )
+    for ws, r in zip(sockets, results):
+        if isinstance(r, BaseException):
+            _active_ws.discard(ws)
+            # Closing ends the client's receive loop so it reconnects
+            task = asyncio.create_task(_close_dropped(ws))
+            _close_tasks.add(task)
+            task.add_done_callback(_close_tasks.discard)
+
+
+async def _close_dropped(ws: WebSocket) -> None:
+    try:
+        await asyncio.wait_for(ws.close(code=1011), _CLOSE_TIMEOUT_S)
+    except Exception:
+        pass
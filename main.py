@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 
 def _ensure_single_instance() -> None:
@@ -88,20 +90,25 @@ from nexus.core.agent_registry import AgentRegistry
 from nexus.core.three_stream import StreamEvent
 from nexus.providers.llm_provider import LLMProvider
 from nexus.providers.model_config import ModelRouter
-from nexus.memory.hybrid_store import HybridMemory
-from nexus.gateway.telegram_channel import TelegramChannel
 from nexus.gateway.hub import MessageHub
-from nexus.gateway.api_channel import init_api_channel, set_memory as _set_api_memory
+from nexus.gateway.api_channel import (
+    init_api_channel, set_memory as _set_api_memory, set_rate_limiter as _set_api_rate_limiter,
+)
 from nexus.gateway.voice_channel import router as _voice_router
 from nexus.security.auth import verify_request, verify_websocket, require_auth, get_api_key, get_user_token
-from nexus.security.rate_limiter import RateLimiter
 from nexus.security import token_vault as _tv
-from nexus.skills.skill_loader import SkillLoader
-from nexus.core.schedule_runner import ScheduleRunner
 
 import datetime
 from dataclasses import asdict as _dc_asdict
 
+if TYPE_CHECKING:
+    # Optional-path components are imported inside lifespan (see there)
+    from nexus.core.schedule_runner import ScheduleRunner
+    from nexus.gateway.telegram_channel import TelegramChannel
+    from nexus.memory.hybrid_store import HybridMemory
+    from nexus.security.rate_limiter import RateLimiter
+    from nexus.skills.skill_loader import SkillLoader
+
 load_dotenv()
 
 logging.basicConfig(
@@ -110,6 +117,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nexus")
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _ResponseClass
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads  # takes str or raw bytes
+except ImportError:  # optional speedup
+    _ResponseClass = JSONResponse
+    _dumps = json.dumps
+    _loads = json.loads
+
+try:
+    import ormsgpack
+
+    def _packb(obj) -> bytes:
+        return ormsgpack.packb(obj, default=str, option=ormsgpack.OPT_NON_STR_KEYS)
+except ImportError:  # optional: /ws?format=msgpack then falls back to JSON
+    _packb = None
+
 # ── Global components (initialized in lifespan) ──
 budget: BudgetController | None = None
 orchestrator: Orchestrator | None = None
@@ -118,18 +145,181 @@ memory: HybridMemory | None = None
 telegram: TelegramChannel | None = None
 skill_loader: SkillLoader | None = None
 llm_provider: LLMProvider | None = None
-active_websockets: list[WebSocket] = []
+active_websockets: set[WebSocket] = set()
+_msgpack_websockets: set[WebSocket] = set()  # subset of active_websockets sent binary frames
+_BROADCAST_TIMEOUT_S = 2.0  # per-client send budget for event broadcasts
+_CLOSE_TIMEOUT_S = 1.0  # budget for closing a client dropped from broadcasts
+_close_tasks: set[asyncio.Task] = set()
 rate_limiter: RateLimiter | None = None
 _schedule_runner: ScheduleRunner | None = None
 # Use asyncio.Event instead of a plain bool so waiters can block on it
 # (created in lifespan so the event loop is already running).
 _init_event: asyncio.Event | None = None
+# Agent/skill topology is fixed after startup; /api/dashboard serves these as-is
+_agent_meta: list[dict[str, Any]] = []
+_skill_meta: list[dict[str, Any]] = []
+_schedule_skill: Any = None
+_INIT_WAIT_S = 30.0
+
+
+async def _wait_for_init(timeout: float = _INIT_WAIT_S) -> bool:
+    """Hold a request until background init finishes; False if it is still running."""
+    if _init_event is None:
+        return False
+    if _init_event.is_set():
+        return True
+    try:
+        await asyncio.wait_for(_init_event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+# ── WebSocket frames ──
+def _static_frame(payload: dict[str, Any]) -> tuple[str, bytes | None]:
+    """Encode a fixed payload once, as JSON text and (if available) MessagePack."""
+    return _dumps(payload), (_packb(payload) if _packb is not None else None)
+
+
+_INIT_HOLD_FRAME = _static_frame({
+    "type": "final_answer",
+    "stream": "orchestrator",
+    "content": "System is still initializing, please wait a moment...",
+    "metadata": {},
+})
+_PROCESSING_ERROR_FRAME = _static_frame({
+    "type": "error",
+    "stream": "analysis",
+    "content": "⚠️ 處理時發生錯誤，請稍後再試。",
+    "metadata": {},
+})
+
+_CHAT_INIT_BODY = _dumps({"answer": "System is still initializing...", "events": [], "budget": {}})
+
+
+async def _send_static(ws: WebSocket, frame: tuple[str, bytes | None]) -> None:
+    if ws in _msgpack_websockets:
+        await ws.send_bytes(frame[1])
+    else:
+        await ws.send_text(frame[0])
+
+
+async def _send_event(ws: WebSocket, event: StreamEvent) -> None:
+    if ws in _msgpack_websockets:
+        await ws.send_bytes(_packb(event.payload()))
+    else:
+        await ws.send_text(event.to_json())
+
+
+# ── WebSocket broadcast batching ──
+# Trace events arrive in bursts; events queued within one window go out as a
+# single {"type": "batch", "events": [...]} message instead of many tiny ones
+_BATCH_WINDOW_S = 0.01
+_BATCH_MAX_EVENTS = 16
+_pending_events: list[StreamEvent] = []
+_flush_handle: asyncio.TimerHandle | None = None
+_fanout_lock: asyncio.Lock | None = None
+_fanout_tasks: set[asyncio.Task] = set()
+
+
+def _queue_event(event: StreamEvent) -> None:
+    global _flush_handle
+    _pending_events.append(event)
+    if len(_pending_events) >= _BATCH_MAX_EVENTS:
+        _flush_events()
+    elif _flush_handle is None:
+        _flush_handle = asyncio.get_running_loop().call_later(_BATCH_WINDOW_S, _flush_events)
+
+
+def _flush_events() -> None:
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    if not _pending_events:
+        return
+    events = _pending_events.copy()
+    _pending_events.clear()
+    task = asyncio.create_task(_fan_out(events))
+    _fanout_tasks.add(task)
+    task.add_done_callback(_fanout_tasks.discard)
+
+
+async def _drain_broadcasts() -> None:
+    """Send queued trace events now and wait until every batch has gone out.
+
+    Called before a direct reply, so clients never see a trace event after the
+    answer it led up to.
+    """
+    _flush_events()
+    if _fanout_tasks:
+        await asyncio.gather(*_fanout_tasks, return_exceptions=True)
+
+
+async def _fan_out(events: list[StreamEvent]) -> None:
+    global _fanout_lock
+    if _fanout_lock is None:
+        _fanout_lock = asyncio.Lock()
+    # The lock is FIFO, so batches reach every client in the order they were cut
+    async with _fanout_lock:
+        sockets = list(active_websockets)  # snapshot: sockets may join/leave while awaiting
+        if not sockets:
+            return
+        # Each format is encoded once per batch, and only if some client uses it
+        if len(events) == 1:
+            text = events[0].to_json()
+        else:
+            # Frames are already JSON, so the batch is assembled without re-encoding
+            text = '{"type":"batch","events":[' + ",".join(e.to_json() for e in events) + "]}"
+        binary = b""
+        if not _msgpack_websockets.isdisjoint(sockets):
+            binary = _packb(events[0].payload() if len(events) == 1 else {
+                "type": "batch", "events": [e.payload() for e in events],
+            })
+        # Send to all clients at once; a client that cannot take the frame
+        # within the budget is dropped instead of stalling the stream
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    ws.send_bytes(binary) if ws in _msgpack_websockets else ws.send_text(text),
+                    _BROADCAST_TIMEOUT_S,
+                )
+                for ws in sockets
+            ),
+            return_exceptions=True,
+        )
+    disconnected = [ws for ws, r in zip(sockets, results) if isinstance(r, BaseException)]
+    if disconnected:
+        logger.debug("WebSocket broadcast failed for %d client(s), removing", len(disconnected))
+        active_websockets.difference_update(disconnected)
+        _msgpack_websockets.difference_update(disconnected)
+        for ws in disconnected:
+            task = asyncio.create_task(_close_dropped(ws))
+            _close_tasks.add(task)
+            task.add_done_callback(_close_tasks.discard)
+
+
+async def _close_dropped(ws: WebSocket) -> None:
+    """Close a client dropped from broadcasts.
+
+    A timed-out send may have left half a frame on the wire, and an open socket
+    would keep its /ws handler waiting on receive; closing ends that loop and
+    lets the browser reconnect.
+    """
+    try:
+        await asyncio.wait_for(ws.close(code=1011), _CLOSE_TIMEOUT_S)
+    except Exception:
+        pass  # already gone or stuck; either way it is no longer ours
+
 
 # ── API Channel (MessageHub + REST router, wired in lifespan) ──
 _hub = MessageHub()
 _api_v1_router = init_api_channel(_hub)
 
 
+_WEEKDAYS_ZH = ("一", "二", "三", "四", "五", "六", "日")
+
+
 async def _morning_report_check(orch, tg) -> None:
     """啟動時晨報補送：若今天尚未發送且現在是早上 6-11 點，自動送出。"""
     now = datetime.datetime.now()
@@ -139,18 +329,16 @@ async def _morning_report_check(orch, tg) -> None:
     report_file = config.data_dir() / "morning_report.json"
     today = now.strftime("%Y-%m-%d")
 
-    if report_file.exists():
-        try:
-            data = json.loads(report_file.read_text(encoding="utf-8"))
-            if data.get("last_date") == today:
-                logger.info("Morning report already sent today, skipping.")
-                return
-        except Exception:
-            pass
+    try:
+        data = _loads(report_file.read_bytes())
+        if data.get("last_date") == today:
+            logger.info("Morning report already sent today, skipping.")
+            return
+    except Exception:
+        pass  # missing or unreadable state file: send the report
 
     logger.info("Morning report: generating...")
-    weekdays = ["一", "二", "三", "四", "五", "六", "日"]
-    weekday = weekdays[now.weekday()]
+    weekday = _WEEKDAYS_ZH[now.weekday()]
     prompt = (
         f"現在是 {today} 星期{weekday} 早上 {now.strftime('%H:%M')}。"
         "請給我一份簡短的晨報，包含：今日日期星期、一句激勵話語、今天值得注意的事項提醒。"
@@ -172,10 +360,7 @@ async def _morning_report_check(orch, tg) -> None:
             # Atomic write: write to .tmp then rename so a crash mid-write
             # never leaves a corrupt state file that blocks tomorrow's report.
             tmp_path = report_file.with_suffix(".tmp")
-            tmp_path.write_text(
-                json.dumps({"last_date": today}, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            tmp_path.write_text(_dumps({"last_date": today}), encoding="utf-8")
             tmp_path.replace(report_file)
             logger.info("Morning report sent and recorded.")
 
@@ -261,6 +446,7 @@ async def _deferred_init(llm, mem, orch, tg, bdg):
             (s for s in skill_loader.list_skills() if s.name == "auto_schedule"), None
         )
         if schedule_skill:
+            from nexus.core.schedule_runner import ScheduleRunner
             _schedule_runner = ScheduleRunner(schedule_skill, orch, tg)
             _schedule_runner.start()
             logger.info("ScheduleRunner started.")
@@ -285,6 +471,7 @@ async def _deferred_init(llm, mem, orch, tg, bdg):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global budget, orchestrator, registry, memory, telegram, rate_limiter, skill_loader, llm_provider, _init_event
+    global _agent_meta, _skill_meta, _schedule_skill
     _init_event = asyncio.Event()  # created here so event loop is already running
 
     logger.info("=" * 50)
@@ -292,11 +479,17 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 50)
     config.data_dir()  # ensure data dir exists
 
+    # Deferred so importing nexus.main (tests, tooling, uvicorn startup) does not
+    # pay for ChromaDB, the Telegram SDK and the skill tree up front
+    from nexus.gateway.telegram_channel import TelegramChannel
+    from nexus.memory.hybrid_store import HybridMemory
+    from nexus.security.rate_limiter import RateLimiter
+    from nexus.skills.skill_loader import SkillLoader
+
     # Initialize lightweight components immediately
     rate_limiter = RateLimiter()
     # Pass rate_limiter into api_channel (router already registered at module load)
-    from nexus.gateway import api_channel as _api_ch
-    _api_ch._rate_limiter = rate_limiter
+    _set_api_rate_limiter(rate_limiter)
     budget = BudgetController()
     router = ModelRouter()
     llm = LLMProvider(budget, router)
@@ -306,14 +499,17 @@ async def lifespan(app: FastAPI):
 
     # Auto-discover agents and inject dependencies
     await registry.auto_discover()
-    for agent in registry.list_agents():
-        if hasattr(agent, "set_llm"):
-            agent.set_llm(llm)
-        if hasattr(agent, "set_dependencies"):
-            if agent.name == "knowledge":
-                agent.set_dependencies(memory, llm)
-            elif agent.name == "optimizer":
-                agent.set_dependencies(budget, memory)
+    for agent in registry.with_hook("set_llm"):
+        agent.set_llm(llm)
+    # set_dependencies signatures differ per agent
+    deps_table = {
+        "knowledge": (memory, llm),
+        "optimizer": (budget, memory),
+    }
+    for agent in registry.with_hook("set_dependencies"):
+        deps = deps_table.get(agent.name)
+        if deps is not None:
+            agent.set_dependencies(*deps)
     logger.info(f"Loaded {len(registry.list_agents())} agents: {[a.name for a in registry.list_agents()]}")
 
     orchestrator = Orchestrator(budget, llm, router, registry)
@@ -329,33 +525,41 @@ async def lifespan(app: FastAPI):
     logger.info(f"Loaded {len(skill_names)} skills: {skill_names}")
 
     # Give research agent access to web_search skill
-    for agent in registry.list_agents():
-        if agent.name == "research" and hasattr(agent, "set_skill_loader"):
+    for agent in registry.with_hook("set_skill_loader"):
+        if agent.name == "research":
             agent.set_skill_loader(skill_loader)
             logger.info("Injected skill_loader into research agent")
 
-    # Broadcast events to all connected WebSockets
+    # Snapshot dashboard metadata once; neither registry changes after this point
+    _agent_meta = [
+        {"name": a.name, "description": getattr(a, "description", "")}
+        for a in registry.list_agents()
+    ]
+    _skill_meta = [
+        {
+            "name": s.name,
+            "description": getattr(s, "description", ""),
+            "category": getattr(s, "category", "general"),
+        }
+        for s in skill_loader.list_skills()
+    ]
+    _schedule_skill = next(
+        (s for s in skill_loader.list_skills() if s.name == "auto_schedule"), None
+    )
+
+    # Broadcast events to all connected WebSockets (coalesced, see _queue_event)
     async def broadcast_event(event: StreamEvent):
-        msg = json.dumps({
-            "type": event.event_type,
-            "stream": event.stream,
-            "content": event.content,
-            "metadata": event.metadata,
-        })
-        disconnected = []
-        for ws in active_websockets:
-            try:
-                await ws.send_text(msg)
-            except Exception as _e:
-                logger.debug(f"WebSocket broadcast failed, removing: {_e}")
-                disconnected.append(ws)
-        for ws in disconnected:
-            active_websockets.remove(ws)
+        if active_websockets:
+            _queue_event(event)
 
     orchestrator.on_event(broadcast_event)
 
     telegram = TelegramChannel()
 
+    # Pre-render the static pages now that config and env are loaded
+    for page in ("index.html", "dashboard.html"):
+        _render_page(page)
+
     port = int(os.getenv("PORT", config.get("app.port", 8000)))
     logger.info("=" * 50)
     logger.info("  Nexus AI accepting requests!")
@@ -383,8 +587,10 @@ async def lifespan(app: FastAPI):
         await memory.close()
 
 
-app = FastAPI(title="Nexus AI", version="0.1.0", lifespan=lifespan)
-
+app = FastAPI(
+    title="Nexus AI", version="0.1.0", lifespan=lifespan,
+    default_response_class=_ResponseClass,
+)
 # Mount REST API channel (hub wired to orchestrator in lifespan)
 app.include_router(_api_v1_router)
 # Mount Voice channel (Gemini Live API WebSocket)
@@ -407,13 +613,35 @@ async def service_worker():
     )
 
 
+# index/dashboard only depend on settings fixed at startup: render each once
+_pages: dict[str, tuple[str, str]] = {}  # template name -> (html, etag)
+
+
+def _render_page(name: str) -> tuple[str, str]:
+    page = _pages.get(name)
+    if page is None:
+        html = templates.get_template(name).render(
+            app_name=config.get("app.name", "Nexus AI"),
+            api_key=get_api_key() or "",
+        )
+        etag = '"' + hashlib.blake2b(html.encode(), digest_size=8).hexdigest() + '"'
+        page = _pages[name] = (html, etag)
+    return page
+
+
+def _page_response(request: Request, name: str) -> Response:
+    html, etag = _render_page(name)
+    # The page embeds the API key, so keep it out of shared caches and
+    # revalidate on every load (answered with 304 while unchanged)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "app_name": config.get("app.name", "Nexus AI"),
-        "api_key": get_api_key() or "",
-    })
+    return _page_response(request, "index.html")
 
 
 @app.websocket("/ws")
@@ -423,26 +651,24 @@ async def websocket_endpoint(ws: WebSocket):
         return
 
     await ws.accept()
-    active_websockets.append(ws)
+    active_websockets.add(ws)
+    # ?format=msgpack: same frames as binary MessagePack (JSON if ormsgpack is missing)
+    if ws.query_params.get("format") == "msgpack" and _packb is not None:
+        _msgpack_websockets.add(ws)
     logger.info(f"WebSocket connected. Total: {len(active_websockets)}")
 
     try:
         while True:
-            data = await ws.receive_text()
-            msg = json.loads(data)
+            msg = _loads(await ws.receive_text())
             user_input = msg.get("content", "")
             session_id = msg.get("session_id", "default")
 
             if not user_input.strip():
                 continue
 
-            if _init_event is None or not _init_event.is_set():
-                await ws.send_text(json.dumps({
-                    "type": "final_answer",
-                    "stream": "orchestrator",
-                    "content": "System is still initializing, please wait a moment...",
-                    "metadata": {},
-                }))
+            # Messages sent during startup wait for init instead of bouncing straight back
+            if not await _wait_for_init():
+                await _send_static(ws, _INIT_HOLD_FRAME)
                 continue
 
             # Build extra_context for image if provided
@@ -456,24 +682,16 @@ async def websocket_endpoint(ws: WebSocket):
             # Process through orchestrator
             try:
                 async for event in orchestrator.process(user_input, session_id, extra_context=extra_ctx, force_agent=force_agent):
-                    await ws.send_text(json.dumps({
-                        "type": event.event_type,
-                        "stream": event.stream,
-                        "content": event.content,
-                        "metadata": event.metadata,
-                    }))
+                    if _pending_events or _fanout_tasks:
+                        await _drain_broadcasts()
+                    await _send_event(ws, event)
             except Exception as e:
                 logger.error(f"Processing error: {e}")
-                await ws.send_text(json.dumps({
-                    "type": "error",
-                    "stream": "analysis",
-                    "content": "⚠️ 處理時發生錯誤，請稍後再試。",
-                    "metadata": {},
-                }))
+                await _send_static(ws, _PROCESSING_ERROR_FRAME)
 
     except WebSocketDisconnect:
-        if ws in active_websockets:
-            active_websockets.remove(ws)
+        active_websockets.discard(ws)
+        _msgpack_websockets.discard(ws)
         logger.info(f"WebSocket disconnected. Total: {len(active_websockets)}")
 
 
@@ -570,7 +788,7 @@ async def api_auth_connections(request: Request):
 @app.post("/api/brain")
 async def api_set_brain(request: Request):
     """切換大腦模式：gemini / gemini_web / local / auto"""
-    data = await request.json()
+    data = _loads(await request.body())
     mode = data.get("mode", "auto")
     if mode not in ("gemini", "gemini_web", "local", "auto"):
         return JSONResponse(status_code=400, content={"error": "無效的模式"})
@@ -656,10 +874,10 @@ async def api_chat(request: Request):
                 },
             )
 
-    if _init_event is None or not _init_event.is_set():
-        return {"answer": "System is still initializing...", "events": [], "budget": {}}
+    if not await _wait_for_init():
+        return Response(_CHAT_INIT_BODY, media_type="application/json")
 
-    body = await request.json()
+    body = _loads(await request.body())
     user_input = body.get("content", "")
     session_id = body.get("session_id", "default")
     user_token = get_user_token(request)  # Auth0 JWT (None if not logged in)
@@ -684,11 +902,7 @@ async def api_chat(request: Request):
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
-    return templates.TemplateResponse("dashboard.html", {
-        "request": request,
-        "app_name": config.get("app.name", "Nexus AI"),
-        "api_key": get_api_key() or "",
-    })
+    return _page_response(request, "dashboard.html")
 
 
 @app.get("/voice", response_class=HTMLResponse)
@@ -700,32 +914,17 @@ async def voice_page(request: Request):
 async def api_dashboard():
     """Dashboard data: budget, agents, skills with categories, schedules, channel status."""
     schedules: list = []
-    if skill_loader:
-        schedule_skill = next(
-            (s for s in skill_loader.list_skills() if s.name == "auto_schedule"), None
-        )
-        if schedule_skill and hasattr(schedule_skill, "get_schedules"):
-            try:
-                raw = schedule_skill.get_schedules()
-                schedules = [_dc_asdict(e) for e in raw]
-            except Exception:
-                pass
+    if _schedule_skill is not None and hasattr(_schedule_skill, "get_schedules"):
+        try:
+            schedules = [_dc_asdict(e) for e in _schedule_skill.get_schedules()]
+        except Exception:
+            pass
 
     return {
         "status": "operational" if (_init_event is not None and _init_event.is_set()) else "initializing",
         "budget": budget.get_status() if budget else {},
-        "agents": [
-            {"name": a.name, "description": getattr(a, "description", "")}
-            for a in registry.list_agents()
-        ] if registry else [],
-        "skills": [
-            {
-                "name": s.name,
-                "description": getattr(s, "description", ""),
-                "category": getattr(s, "category", "general"),
-            }
-            for s in skill_loader.list_skills()
-        ] if skill_loader else [],
+        "agents": _agent_meta,
+        "skills": _skill_meta,
         "schedules": schedules,
         "telegram": bool(telegram and getattr(telegram, "_running", False)),
         "brain": llm_provider.active_brain if llm_provider else "unknown",
@@ -15,6 +15,11 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+async def _nothing(result):
+    """Placeholder awaitable for a memory layer that is not configured."""
+    return result
+
+
 class MemoryConsolidator:
     """Background task that periodically consolidates memory layers.
 
@@ -47,14 +52,19 @@ class MemoryConsolidator:
                 pass
 
     async def _loop(self) -> None:
+        # Sleep to an absolute deadline so the cycle's own runtime does not push
+        # every later run back; an overrunning cycle makes the next one start at once
+        loop = asyncio.get_running_loop()
+        next_deadline = loop.time() + self.interval
         while self._running:
             try:
-                await asyncio.sleep(self.interval)
+                await asyncio.sleep(max(0.0, next_deadline - loop.time()))
                 await self.consolidate()
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Consolidation error: {e}")
+                logger.error("Consolidation error: %s", e)
+            next_deadline += self.interval
 
     async def consolidate(self) -> dict[str, int]:
         """Run a single consolidation cycle."""
@@ -64,30 +74,32 @@ class MemoryConsolidator:
         self.memory.working.decay_all(rate=0.1)
         stats["working_slots"] = self.memory.working.size
 
-        # 2. Decay knowledge graph
-        if self.memory.kg:
-            removed = await self.memory.kg.decay()
+        # 2-4. Graph decay, procedure cleanup and lesson lookup touch separate
+        # stores, so they are issued together rather than one after another
+        mem = self.memory
+        removed, cleaned, lessons = await asyncio.gather(
+            mem.kg.decay() if mem.kg else _nothing(0),
+            mem.procedural.cleanup(min_confidence=0.2) if mem.procedural else _nothing(0),
+            mem.episodic.get_lessons(limit=5) if mem.episodic and mem.fts else _nothing([]),
+        )
+        if mem.kg:
             stats["kg_nodes_removed"] = removed
-
-        # 3. Clean procedural memory
-        if self.memory.procedural:
-            cleaned = await self.memory.procedural.cleanup(min_confidence=0.2)
+        if mem.procedural:
             stats["procedures_cleaned"] = cleaned
 
-        # 4. Promote high-value episodic to semantic
-        if self.memory.episodic and self.memory.fts:
-            lessons = await self.memory.episodic.get_lessons(limit=5)
-            promoted = 0
-            for lesson in lessons:
-                if lesson and len(lesson) > 10:
-                    await self.memory.fts.store(
-                        title="Lesson",
-                        content=lesson,
-                        category="episodic_promotion",
-                        source="consolidation",
-                    )
-                    promoted += 1
-            stats["lessons_promoted"] = promoted
+        # Promote high-value episodic lessons to semantic memory
+        if mem.episodic and mem.fts:
+            worth = [lesson for lesson in lessons if lesson and len(lesson) > 10]
+            await asyncio.gather(*(
+                mem.fts.store(
+                    title="Lesson",
+                    content=lesson,
+                    category="episodic_promotion",
+                    source="consolidation",
+                )
+                for lesson in worth
+            ))
+            stats["lessons_promoted"] = len(worth)
 
         logger.info(f"Consolidation complete: {stats}")
         return stats
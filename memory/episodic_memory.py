@@ -3,17 +3,53 @@ Uses SQLite for persistence. Low token cost (only for lesson extraction)."""
 
 from __future__ import annotations
 
+import hashlib
 import json
 import sqlite3
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
+try:
+    import orjson
 
-@dataclass
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    _loads = orjson.loads
+except ImportError:  # optional speedup
+    _dumps = json.dumps
+    _loads = json.loads
+
+# store() checks the size limit once per this many writes, not on every insert
+_TRIM_EVERY = 64
+
+# Hot-path statements, kept as constants so every call hands sqlite3 the same
+# string and hits its prepared-statement cache
+_EPISODE_COLUMNS = "id, query, response, lesson, confidence, timestamp, metadata"
+_INSERT_SQL = (
+    "INSERT INTO episodes (query, response, lesson, confidence, timestamp, metadata) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SEARCH_FTS_SQL = (
+    "SELECT e.id, e.query, e.response, e.lesson, e.confidence, e.timestamp, e.metadata "
+    "FROM episodes_fts f JOIN episodes e ON e.id = f.rowid "
+    "WHERE episodes_fts MATCH ? "
+    "ORDER BY e.timestamp DESC LIMIT ?"
+)
+_SEARCH_LIKE_SQL = (
+    f"SELECT {_EPISODE_COLUMNS} "
+    "FROM episodes WHERE query LIKE ? OR response LIKE ? OR lesson LIKE ? "
+    "ORDER BY timestamp DESC LIMIT ?"
+)
+_RECENT_SQL = f"SELECT {_EPISODE_COLUMNS} FROM episodes ORDER BY timestamp DESC LIMIT ?"
+_LESSONS_SQL = "SELECT lesson FROM episodes WHERE lesson != '' ORDER BY confidence DESC LIMIT ?"
+
+
+@dataclass(slots=True)
 class Episode:
     id: int
     query: str
@@ -27,14 +63,24 @@ class Episode:
 class EpisodicMemory:
     """Stores recent interactions and auto-extracts lessons learned."""
 
-    def __init__(self, db_path: Path | None = None, max_entries: int | None = None) -> None:
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        max_entries: int | None = None,
+        conn: sqlite3.Connection | None = None,
+    ) -> None:
         self.db_path = db_path or Path(config.get("memory.sqlite_path", "./data/nexus.db"))
         self.max_entries = max_entries or config.get("memory.episodic_max_entries", 1000)
-        self._conn: sqlite3.Connection | None = None
+        self._conn = conn
+        self._owns_conn = conn is None  # a passed-in connection is closed by whoever made it
+        self._cur: sqlite3.Cursor | None = None  # reused by the hot-path methods
+        self._row_count = 0  # kept in step with the table by the write paths
+        self._writes_since_trim = 0
 
     async def initialize(self) -> None:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite_tuning.connect(self.db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS episodes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,7 +95,52 @@ class EpisodicMemory:
         self._conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_episodes_ts ON episodes(timestamp DESC)
         """)
+        # Partial index matching get_lessons(): only rows that carry a lesson
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_episodes_confidence
+            ON episodes(confidence DESC) WHERE lesson != ''
+        """)
+        # Trigram FTS5 index over the text columns: substring search (including
+        # CJK text, which has no word breaks) without scanning every episode
+        has_index = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'episodes_fts'"
+        ).fetchone()
+        self._conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS episodes_fts USING fts5(
+                query, response, lesson,
+                content='episodes', content_rowid='id',
+                tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS episodes_ai AFTER INSERT ON episodes BEGIN
+                INSERT INTO episodes_fts (rowid, query, response, lesson)
+                VALUES (new.id, new.query, new.response, new.lesson);
+            END;
+            CREATE TRIGGER IF NOT EXISTS episodes_ad AFTER DELETE ON episodes BEGIN
+                INSERT INTO episodes_fts (episodes_fts, rowid, query, response, lesson)
+                VALUES ('delete', old.id, old.query, old.response, old.lesson);
+            END;
+            CREATE TRIGGER IF NOT EXISTS episodes_au
+            AFTER UPDATE OF query, response, lesson ON episodes BEGIN
+                INSERT INTO episodes_fts (episodes_fts, rowid, query, response, lesson)
+                VALUES ('delete', old.id, old.query, old.response, old.lesson);
+                INSERT INTO episodes_fts (rowid, query, response, lesson)
+                VALUES (new.id, new.query, new.response, new.lesson);
+            END;
+        """)
+        # LLM-extracted lessons keyed by the SHA-256 of the prompt that produced them
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS lesson_cache (
+                key BLOB PRIMARY KEY,
+                lesson TEXT NOT NULL,
+                timestamp REAL NOT NULL
+            )
+        """)
+        if not has_index:
+            # Index episodes written before the FTS table existed
+            self._conn.execute("INSERT INTO episodes_fts (episodes_fts) VALUES ('rebuild')")
         self._conn.commit()
+        self._row_count = self._conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+        self._cur = self._conn.cursor()
 
     async def store(
         self,
@@ -60,40 +151,64 @@ class EpisodicMemory:
         metadata: dict | None = None,
     ) -> int:
         """Store an interaction episode."""
-        cursor = self._conn.execute(
-            "INSERT INTO episodes (query, response, lesson, confidence, timestamp, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-            (query, response, lesson, confidence, time.time(), json.dumps(metadata or {})),
+        self._cur.execute(
+            _INSERT_SQL,
+            (query, response, lesson, confidence, time.time(), _dumps(metadata) if metadata else ""),
         )
+        episode_id = self._cur.lastrowid
+        self._conn.commit()
+        self._row_count += 1
+        self._writes_since_trim += 1
+        # Amortized: the table may run up to _TRIM_EVERY - 1 rows over the limit
+        if self._writes_since_trim >= _TRIM_EVERY:
+            await self._enforce_limit()
+        return episode_id
+
+    async def store_many(self, episodes: Iterable[dict[str, Any]]) -> int:
+        """Store several episodes in one transaction.
+
+        Each item takes the keyword arguments of store(); returns the number stored.
+        """
+        now = time.time()
+        rows = [
+            (
+                ep["query"], ep["response"], ep.get("lesson", ""), ep.get("confidence", 0.5),
+                now, _dumps(ep["metadata"]) if ep.get("metadata") else "",
+            )
+            for ep in episodes
+        ]
+        if not rows:
+            return 0
+        self._cur.executemany(_INSERT_SQL, rows)
         self._conn.commit()
+        self._row_count += len(rows)
         await self._enforce_limit()
-        return cursor.lastrowid
+        return len(rows)
 
     async def search(self, query: str, limit: int = 5) -> list[Episode]:
-        """Search episodes by keyword matching."""
-        rows = self._conn.execute(
-            "SELECT id, query, response, lesson, confidence, timestamp, metadata "
-            "FROM episodes WHERE query LIKE ? OR response LIKE ? OR lesson LIKE ? "
-            "ORDER BY timestamp DESC LIMIT ?",
-            (f"%{query}%", f"%{query}%", f"%{query}%", limit),
-        ).fetchall()
-        return [self._row_to_episode(r) for r in rows]
+        """Search episodes by substring match on query, response or lesson."""
+        if len(query) >= 3:
+            # Quoted as one phrase, a trigram MATCH is the same substring test as LIKE
+            phrase = '"' + query.replace('"', '""') + '"'
+            try:
+                self._cur.execute(_SEARCH_FTS_SQL, (phrase, limit))
+                return [self._row_to_episode(r) for r in self._cur]
+            except sqlite3.OperationalError:
+                pass  # fall back to scanning below
+        # Trigrams cannot match queries shorter than three characters
+        pattern = f"%{query}%"
+        self._cur.execute(_SEARCH_LIKE_SQL, (pattern, pattern, pattern, limit))
+        return [self._row_to_episode(r) for r in self._cur]
 
     async def get_recent(self, limit: int = 10) -> list[Episode]:
         """Get most recent episodes."""
-        rows = self._conn.execute(
-            "SELECT id, query, response, lesson, confidence, timestamp, metadata "
-            "FROM episodes ORDER BY timestamp DESC LIMIT ?",
-            (limit,),
-        ).fetchall()
-        return [self._row_to_episode(r) for r in rows]
+        self._cur.execute(_RECENT_SQL, (limit,))
+        return [self._row_to_episode(r) for r in self._cur]
 
     async def get_lessons(self, limit: int = 20) -> list[str]:
         """Get distilled lessons from past episodes."""
-        rows = self._conn.execute(
-            "SELECT lesson FROM episodes WHERE lesson != '' ORDER BY confidence DESC LIMIT ?",
-            (limit,),
-        ).fetchall()
-        return [r[0] for r in rows]
+        self._cur.execute(_LESSONS_SQL, (limit,))
+        return [lesson for (lesson,) in self._cur]
 
     async def extract_lesson(self, query: str, response: str, llm_call=None) -> str:
         """Extract a lesson from an interaction. Uses LLM if provided, else simple heuristic."""
@@ -103,32 +218,54 @@ class EpisodicMemory:
                 f"Q: {query[:200]}\nA: {response[:300]}\n"
                 f"Lesson (1 sentence):"
             )
+            # The prompt only sees the truncated texts, so hashing it means pairs
+            # that differ past the cut share an entry, and a prompt change misses
+            key = hashlib.sha256(prompt.encode()).digest()
+            row = self._conn.execute(
+                "SELECT lesson FROM lesson_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                return row[0]
             try:
-                return await llm_call(prompt)
+                lesson = await llm_call(prompt)
             except Exception:
                 pass
+            else:
+                if lesson:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO lesson_cache (key, lesson, timestamp) VALUES (?, ?, ?)",
+                        (key, lesson, time.time()),
+                    )
+                    self._conn.commit()
+                return lesson
         # Heuristic fallback
         if len(response) > 200:
             return f"Answered question about: {query[:50]}"
         return ""
 
     async def _enforce_limit(self) -> None:
-        count = self._conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
-        if count > self.max_entries:
-            excess = count - self.max_entries
+        self._writes_since_trim = 0
+        if self._row_count > self.max_entries:
+            excess = self._row_count - self.max_entries
             self._conn.execute(
-                "DELETE FROM episodes WHERE id IN (SELECT id FROM episodes ORDER BY timestamp ASC LIMIT ?)",
+                # id is insertion order (AUTOINCREMENT) and, unlike timestamp, has no
+                # ties within a store_many() batch
+                "DELETE FROM episodes WHERE id IN (SELECT id FROM episodes ORDER BY id ASC LIMIT ?)",
                 (excess,),
             )
             self._conn.commit()
+            self._row_count = self.max_entries
 
-    def _row_to_episode(self, row) -> Episode:
+    @staticmethod
+    def _row_to_episode(row: tuple) -> Episode:
+        # Rows are consumed straight off the cursor; the column order matches Episode
+        id_, query, response, lesson, confidence, timestamp, meta = row
         return Episode(
-            id=row[0], query=row[1], response=row[2], lesson=row[3],
-            confidence=row[4], timestamp=row[5],
-            metadata=json.loads(row[6]) if row[6] else {},
+            id_, query, response, lesson, confidence, timestamp,
+            # Empty metadata is stored as '' (older rows: '{}') and never parsed
+            _loads(meta) if meta and meta != "{}" else {},
         )
 
     async def close(self) -> None:
-        if self._conn:
-            self._conn.close()
+        if self._conn and self._owns_conn:
+            sqlite_tuning.close(self._conn)
@@ -11,16 +11,38 @@ This context is injected into prompts to improve future responses.
 
 from __future__ import annotations
 
+import re
 import sqlite3
 import time
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 logger = logging.getLogger(__name__)
 
+_POSITIVE = ("好", "讚", "good", "great", "nice", "correct", "對", "棒", "感謝", "thanks", "👍")
+_NEGATIVE = ("不好", "錯", "bad", "wrong", "重新", "redo", "不對", "差", "爛", "👎")
+# Substring alternations for when the automaton below is unavailable
+_POSITIVE_RE = re.compile("|".join(map(re.escape, _POSITIVE)))
+_NEGATIVE_RE = re.compile("|".join(map(re.escape, _NEGATIVE)))
+
+try:
+    import ahocorasick
+
+    # One automaton over both keyword sets: a single pass finds every hit
+    _FEEDBACK_AUTOMATON = ahocorasick.Automaton()
+    for _word in _POSITIVE:
+        _FEEDBACK_AUTOMATON.add_word(_word, "positive")
+    for _word in _NEGATIVE:
+        if _word not in _FEEDBACK_AUTOMATON:  # a word in both sets counts as positive
+            _FEEDBACK_AUTOMATON.add_word(_word, "negative")
+    _FEEDBACK_AUTOMATON.make_automaton()
+except ImportError:  # optional speedup
+    _FEEDBACK_AUTOMATON = None
+
 
 class ExperienceMemory:
     """Stores and retrieves user experience data for preference learning."""
@@ -28,10 +50,17 @@ class ExperienceMemory:
     def __init__(self) -> None:
         self._db_path = config.data_dir() / "experience.db"
         self._conn: sqlite3.Connection | None = None
+        # In-process copies of the small, rarely written tables, kept in step by
+        # the write paths so the per-prompt reads never reach SQLite
+        self._prefs: dict[str, tuple[str, float]] = {}
+        self._avoidance: list[dict] | None = None
+        # inject_context() sections, rebuilt only after the table behind them changes
+        self._prefs_ctx: str | None = None
+        self._avoid_ctx: str | None = None
 
     async def initialize(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path))
+        self._conn = sqlite_tuning.connect(self._db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS feedback (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -59,7 +88,28 @@ class ExperienceMemory:
                 timestamp REAL NOT NULL
             )
         """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_avoidance_count ON avoidance(count DESC)")
+        has_unique = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'idx_avoidance_pattern'"
+        ).fetchone()
+        if not has_unique:
+            # Older databases may hold repeated patterns; fold them into the first row
+            self._conn.execute("""
+                UPDATE avoidance SET count = (
+                    SELECT SUM(a.count) FROM avoidance a WHERE a.pattern = avoidance.pattern
+                )
+                WHERE id IN (SELECT MIN(id) FROM avoidance GROUP BY pattern HAVING COUNT(*) > 1)
+            """)
+            self._conn.execute(
+                "DELETE FROM avoidance WHERE id NOT IN (SELECT MIN(id) FROM avoidance GROUP BY pattern)"
+            )
+            self._conn.execute("CREATE UNIQUE INDEX idx_avoidance_pattern ON avoidance(pattern)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_type ON feedback(feedback_type)")
         self._conn.commit()
+        self._prefs = {
+            key: (value, conf)
+            for key, value, conf in self._conn.execute("SELECT key, value, confidence FROM preferences")
+        }
 
     async def record_feedback(
         self, query: str, response: str, feedback: str, details: str = ""
@@ -71,14 +121,36 @@ class ExperienceMemory:
             "VALUES (?, ?, ?, ?, ?)",
             (query, response[:300], feedback_type, details, time.time()),
         )
-        self._conn.commit()
-
         # Auto-learn from negative feedback
         if feedback_type == "negative":
-            await self._learn_from_negative(query, response, details)
+            self._learn_from_negative(query, response, details)
+        self._conn.commit()
 
         logger.info(f"Experience feedback recorded: {feedback_type}")
 
+    async def record_many(self, items: Iterable[tuple[str, str, str, str]]) -> int:
+        """Record several (query, response, feedback, details) tuples in one transaction."""
+        now = time.time()
+        rows = []
+        negatives = []
+        for query, response, feedback, details in items:
+            feedback_type = self._classify_feedback(feedback)
+            rows.append((query, response[:300], feedback_type, details, now))
+            if feedback_type == "negative":
+                negatives.append((query, response, details))
+        if not rows:
+            return 0
+        self._conn.executemany(
+            "INSERT INTO feedback (query, response_preview, feedback_type, details, timestamp) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        for query, response, details in negatives:
+            self._learn_from_negative(query, response, details)
+        self._conn.commit()
+        logger.info("Experience feedback recorded: %d entries", len(rows))
+        return len(rows)
+
     async def record_rejection(self, query: str, response: str) -> None:
         """Record when a user re-asks (implicit rejection)."""
         await self.record_feedback(query, response, "negative", "User re-asked the question")
@@ -92,42 +164,41 @@ class ExperienceMemory:
             (key, value, confidence, time.time(), value, confidence, time.time()),
         )
         self._conn.commit()
+        self._prefs[key] = (value, confidence)
+        self._prefs_ctx = None
 
     async def get_preferences(self) -> dict[str, Any]:
-        """Get all learned preferences."""
-        rows = self._conn.execute(
-            "SELECT key, value, confidence FROM preferences ORDER BY confidence DESC"
-        ).fetchall()
-        return {key: {"value": value, "confidence": conf} for key, value, conf in rows}
+        """Get all learned preferences, highest confidence first."""
+        ranked = sorted(self._prefs.items(), key=lambda item: -item[1][1])
+        return {key: {"value": value, "confidence": conf} for key, (value, conf) in ranked}
 
     async def get_avoidance_list(self) -> list[dict]:
         """Get patterns to avoid based on negative feedback."""
-        rows = self._conn.execute(
-            "SELECT pattern, reason, count FROM avoidance ORDER BY count DESC LIMIT 20"
-        ).fetchall()
-        return [{"pattern": p, "reason": r, "count": c} for p, r, c in rows]
+        if self._avoidance is None:
+            rows = self._conn.execute(
+                "SELECT pattern, reason, count FROM avoidance ORDER BY count DESC LIMIT 20"
+            ).fetchall()
+            self._avoidance = [{"pattern": p, "reason": r, "count": c} for p, r, c in rows]
+        return list(self._avoidance)
 
     async def inject_context(self) -> str:
-        """Generate preference context string for prompt injection."""
-        parts = []
+        """Generate preference context string for prompt injection.
 
+        Called on every turn; each section is cached until its table is written.
+        """
         # Preferences
-        prefs = await self.get_preferences()
-        if prefs:
-            pref_lines = []
-            for key, data in list(prefs.items())[:10]:
-                pref_lines.append(f"  - {key}: {data['value']}")
-            if pref_lines:
-                parts.append("User preferences:\n" + "\n".join(pref_lines))
+        if self._prefs_ctx is None:
+            prefs = await self.get_preferences()
+            pref_lines = [f"  - {key}: {data['value']}" for key, data in list(prefs.items())[:10]]
+            self._prefs_ctx = "User preferences:\n" + "\n".join(pref_lines) if pref_lines else ""
 
         # Avoidance
-        avoidance = await self.get_avoidance_list()
-        if avoidance:
+        if self._avoid_ctx is None:
+            avoidance = await self.get_avoidance_list()
             avoid_lines = [f"  - Avoid: {a['pattern']}" for a in avoidance[:5]]
-            if avoid_lines:
-                parts.append("Things to avoid:\n" + "\n".join(avoid_lines))
+            self._avoid_ctx = "Things to avoid:\n" + "\n".join(avoid_lines) if avoid_lines else ""
 
-        return "\n".join(parts) if parts else ""
+        return "\n".join(part for part in (self._prefs_ctx, self._avoid_ctx) if part)
 
     async def get_feedback_stats(self) -> dict[str, int]:
         """Get feedback statistics."""
@@ -139,37 +210,32 @@ class ExperienceMemory:
     def _classify_feedback(self, feedback: str) -> str:
         """Classify feedback text into positive/negative/neutral."""
         text = feedback.lower()
-        positive = ["好", "讚", "good", "great", "nice", "correct", "對", "棒", "感謝", "thanks", "👍"]
-        negative = ["不好", "錯", "bad", "wrong", "重新", "redo", "不對", "差", "爛", "👎"]
+        if _FEEDBACK_AUTOMATON is not None:
+            hits = {label for _, label in _FEEDBACK_AUTOMATON.iter(text)}
+            if "positive" in hits:
+                return "positive"
+            return "negative" if hits else "neutral"
 
-        if any(w in text for w in positive):
+        if _POSITIVE_RE.search(text):
             return "positive"
-        if any(w in text for w in negative):
+        if _NEGATIVE_RE.search(text):
             return "negative"
         return "neutral"
 
-    async def _learn_from_negative(self, query: str, response: str, details: str) -> None:
-        """Extract avoidance patterns from negative feedback."""
+    def _learn_from_negative(self, query: str, response: str, details: str) -> None:
+        """Extract avoidance patterns from negative feedback (caller commits)."""
+        self._avoidance = None
+        self._avoid_ctx = None
         pattern = f"Response style for: {query[:80]}"
         reason = details if details else "User expressed dissatisfaction"
 
-        # Check if similar pattern exists
-        existing = self._conn.execute(
-            "SELECT id, count FROM avoidance WHERE pattern = ?", (pattern,)
-        ).fetchone()
-
-        if existing:
-            self._conn.execute(
-                "UPDATE avoidance SET count = count + 1, timestamp = ? WHERE id = ?",
-                (time.time(), existing[0]),
-            )
-        else:
-            self._conn.execute(
-                "INSERT INTO avoidance (pattern, reason, timestamp) VALUES (?, ?, ?)",
-                (pattern, reason, time.time()),
-            )
-        self._conn.commit()
+        # A repeated pattern bumps the existing row (reason is kept from the first time)
+        self._conn.execute(
+            "INSERT INTO avoidance (pattern, reason, timestamp) VALUES (?, ?, ?) "
+            "ON CONFLICT(pattern) DO UPDATE SET count = count + 1, timestamp = excluded.timestamp",
+            (pattern, reason, time.time()),
+        )
 
     async def close(self) -> None:
         if self._conn:
-            self._conn.close()
+            sqlite_tuning.close(self._conn)
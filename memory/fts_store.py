@@ -5,42 +5,116 @@ from __future__ import annotations
 import json
 import sqlite3
 import time
+from collections import Counter
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from nexus import config
+from nexus.memory import sqlite_tuning
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:  # optional speedup
+    _dumps = json.dumps
+
+# Distinct rows with uncounted hits before search() writes them itself
+_HIT_FLUSH_THRESHOLD = 256
+
+# BM25 weights for knowledge_fts columns (title, content, category, tags):
+# a title hit counts for twice as much as the same hit in the body
+_BM25_WEIGHTS = (10.0, 5.0, 2.0, 3.0)
 
 
 class FTSStore:
     """SQLite FTS5-based keyword search for knowledge retrieval.
     Zero token cost - all local computation."""
 
-    def __init__(self, db_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        conn: sqlite3.Connection | None = None,
+        weights: tuple[float, float, float, float] = _BM25_WEIGHTS,
+    ) -> None:
         self.db_path = db_path or Path(config.get("memory.sqlite_path", "./data/nexus.db"))
-        self._conn: sqlite3.Connection | None = None
+        # Bound as the `rank MATCH` argument, which reweights FTS5's built-in rank
+        self._rank_fn = "bm25({})".format(", ".join(str(float(w)) for w in weights))
+        self._conn = conn
+        self._owns_conn = conn is None  # a passed-in connection is closed by whoever made it
+        self._pending_hits: Counter[int] = Counter()  # rowid -> searches not yet counted
 
     async def initialize(self) -> None:
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
-        # Create FTS5 virtual table
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite_tuning.connect(self.db_path)
+        # Canonical rows; the FTS5 index below stores no second copy of the text
         self._conn.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
-                title, content, category, tags,
-                tokenize='unicode61'
-            )
-        """)
-        # Metadata table for non-FTS data
-        self._conn.execute("""
-            CREATE TABLE IF NOT EXISTS knowledge_meta (
+            CREATE TABLE IF NOT EXISTS knowledge (
                 rowid INTEGER PRIMARY KEY,
+                title TEXT NOT NULL DEFAULT '',
+                content TEXT NOT NULL DEFAULT '',
+                category TEXT NOT NULL DEFAULT '',
+                tags TEXT NOT NULL DEFAULT '',
                 source TEXT DEFAULT '',
                 timestamp REAL NOT NULL,
                 access_count INTEGER DEFAULT 0,
                 metadata TEXT DEFAULT '{}'
             )
         """)
+        migrated = self._has_legacy_index()
+        if migrated:
+            self._migrate_legacy()
+        # External-content FTS5 table kept in sync by the triggers
+        self._conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_fts USING fts5(
+                title, content, category, tags,
+                content='knowledge', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS knowledge_ai AFTER INSERT ON knowledge BEGIN
+                INSERT INTO knowledge_fts (rowid, title, content, category, tags)
+                VALUES (new.rowid, new.title, new.content, new.category, new.tags);
+            END;
+            CREATE TRIGGER IF NOT EXISTS knowledge_ad AFTER DELETE ON knowledge BEGIN
+                INSERT INTO knowledge_fts (knowledge_fts, rowid, title, content, category, tags)
+                VALUES ('delete', old.rowid, old.title, old.content, old.category, old.tags);
+            END;
+            CREATE TRIGGER IF NOT EXISTS knowledge_au
+            AFTER UPDATE OF title, content, category, tags ON knowledge BEGIN
+                INSERT INTO knowledge_fts (knowledge_fts, rowid, title, content, category, tags)
+                VALUES ('delete', old.rowid, old.title, old.content, old.category, old.tags);
+                INSERT INTO knowledge_fts (rowid, title, content, category, tags)
+                VALUES (new.rowid, new.title, new.content, new.category, new.tags);
+            END;
+        """)
+        if migrated:
+            # Index the rows copied over from the old layout
+            self._conn.execute("INSERT INTO knowledge_fts (knowledge_fts) VALUES ('rebuild')")
         self._conn.commit()
 
+    def _has_legacy_index(self) -> bool:
+        """True for databases created when knowledge_fts held its own copy of the text."""
+        row = self._conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'knowledge_fts'"
+        ).fetchone()
+        return row is not None and "content=" not in row[0].replace(" ", "")
+
+    def _migrate_legacy(self) -> None:
+        """Move rows from knowledge_fts + knowledge_meta into knowledge (one-off)."""
+        self._conn.execute("""
+            INSERT OR IGNORE INTO knowledge
+                (rowid, title, content, category, tags, source, timestamp, access_count, metadata)
+            SELECT f.rowid, f.title, f.content, f.category, f.tags,
+                   COALESCE(m.source, ''), COALESCE(m.timestamp, 0),
+                   COALESCE(m.access_count, 0), COALESCE(m.metadata, '{}')
+            FROM knowledge_fts f
+            LEFT JOIN knowledge_meta m ON m.rowid = f.rowid
+        """)
+        self._conn.execute("DROP TABLE knowledge_fts")
+        self._conn.execute("DROP TABLE IF EXISTS knowledge_meta")
+
     async def store(
         self,
         title: str,
@@ -52,46 +126,72 @@ class FTSStore:
     ) -> int:
         """Store a knowledge entry with full-text indexing."""
         cursor = self._conn.execute(
-            "INSERT INTO knowledge_fts (title, content, category, tags) VALUES (?, ?, ?, ?)",
-            (title, content, category, tags),
+            "INSERT INTO knowledge (title, content, category, tags, source, timestamp, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (title, content, category, tags, source, time.time(), _dumps(metadata) if metadata else ""),
         )
-        rowid = cursor.lastrowid
-        self._conn.execute(
-            "INSERT INTO knowledge_meta (rowid, source, timestamp, metadata) VALUES (?, ?, ?, ?)",
-            (rowid, source, time.time(), json.dumps(metadata or {})),
+        # Committed at once: other connections to this file (knowledge graph,
+        # procedures, sessions) must never find a write transaction left open.
+        # Bulk writers amortize the commit through store_many()
+        self._commit()
+        return cursor.lastrowid
+
+    async def store_many(self, entries: Iterable[dict[str, Any]]) -> int:
+        """Store several entries in one transaction.
+
+        Each item takes the keyword arguments of store(); returns the number stored.
+        """
+        now = time.time()
+        rows = [
+            (
+                e["title"], e["content"], e.get("category", ""), e.get("tags", ""),
+                e.get("source", ""), now, _dumps(e["metadata"]) if e.get("metadata") else "",
+            )
+            for e in entries
+        ]
+        if not rows:
+            return 0
+        self._conn.executemany(
+            "INSERT INTO knowledge (title, content, category, tags, source, timestamp, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
         )
-        self._conn.commit()
-        return rowid
+        self._commit()
+        return len(rows)
 
     async def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
-        """Full-text search using FTS5 ranking."""
+        """Full-text search ranked by column-weighted BM25 (title hits first)."""
         try:
+            # MATCH + LIMIT run alone in the CTE so the planner keeps the FTS5
+            # index; the meta join then only touches the top `limit` rows
             rows = self._conn.execute(
-                """SELECT f.rowid, f.title, f.content, f.category, f.tags,
-                          m.source, m.timestamp, rank
-                   FROM knowledge_fts f
-                   LEFT JOIN knowledge_meta m ON f.rowid = m.rowid
-                   WHERE knowledge_fts MATCH ?
-                   ORDER BY rank
-                   LIMIT ?""",
-                (query, limit),
+                """WITH fts_matches AS (
+                       SELECT rowid, rank FROM knowledge_fts
+                       WHERE knowledge_fts MATCH ? AND rank MATCH ?
+                       ORDER BY rank
+                       LIMIT ?
+                   )
+                   SELECT fm.rowid, k.title, k.content, k.category, k.tags,
+                          k.source, k.timestamp, fm.rank
+                   FROM fts_matches fm
+                   JOIN knowledge k ON k.rowid = fm.rowid
+                   ORDER BY fm.rank""",
+                (query, self._rank_fn, limit),
             ).fetchall()
         except sqlite3.OperationalError:
             # FTS match failed (bad query syntax), fall back to LIKE
             rows = self._conn.execute(
-                """SELECT f.rowid, f.title, f.content, f.category, f.tags,
-                          m.source, m.timestamp, 0 as rank
-                   FROM knowledge_fts f
-                   LEFT JOIN knowledge_meta m ON f.rowid = m.rowid
-                   WHERE f.content LIKE ?
-                   ORDER BY m.timestamp DESC
+                """SELECT rowid, title, content, category, tags,
+                          source, timestamp, 0 as rank
+                   FROM knowledge
+                   WHERE content LIKE ?
+                   ORDER BY timestamp DESC
                    LIMIT ?""",
                 (f"%{query}%", limit),
             ).fetchall()
 
-        results = []
-        for row in rows:
-            results.append({
+        results = [
+            {
                 "id": row[0],
                 "title": row[1],
                 "content": row[2],
@@ -100,23 +200,43 @@ class FTSStore:
                 "source": row[5],
                 "timestamp": row[6],
                 "score": -row[7] if row[7] else 0,  # FTS5 rank is negative
-            })
-            # Update access count
-            self._conn.execute(
-                "UPDATE knowledge_meta SET access_count = access_count + 1 WHERE rowid = ?",
-                (row[0],),
-            )
-        self._conn.commit()
+            }
+            for row in rows
+        ]
+        # Access counts are tallied in memory and written with the next write
+        # transaction, keeping searches read-only
+        self._pending_hits.update(r[0] for r in rows)
+        if len(self._pending_hits) >= _HIT_FLUSH_THRESHOLD:
+            self._commit()
         return results
 
-    async def delete(self, rowid: int) -> None:
-        self._conn.execute("DELETE FROM knowledge_fts WHERE rowid = ?", (rowid,))
-        self._conn.execute("DELETE FROM knowledge_meta WHERE rowid = ?", (rowid,))
+    async def flush(self) -> None:
+        """Write any pending access counts."""
+        self._commit()
+
+    def _commit(self) -> None:
+        self._flush_hits()
         self._conn.commit()
 
+    def _flush_hits(self) -> None:
+        """Write pending access counts in one executemany (caller commits)."""
+        if self._pending_hits:
+            self._conn.executemany(
+                "UPDATE knowledge SET access_count = access_count + ? WHERE rowid = ?",
+                [(n, rowid) for rowid, n in self._pending_hits.items()],
+            )
+            self._pending_hits.clear()
+
+    async def delete(self, rowid: int) -> None:
+        self._pending_hits.pop(rowid, None)
+        self._conn.execute("DELETE FROM knowledge WHERE rowid = ?", (rowid,))  # trigger unindexes it
+        self._commit()
+
     async def count(self) -> int:
-        return self._conn.execute("SELECT COUNT(*) FROM knowledge_fts").fetchone()[0]
+        return self._conn.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0]
 
     async def close(self) -> None:
         if self._conn:
-            self._conn.close()
+            self._commit()
+            if self._owns_conn:
+                sqlite_tuning.close(self._conn)
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import sqlite3
+from pathlib import Path
 from typing import Any, TYPE_CHECKING
 
+from nexus import config
+from nexus.memory import sqlite_tuning
 from nexus.memory.working_memory import WorkingMemory
 from nexus.memory.episodic_memory import EpisodicMemory
 from nexus.memory.fts_store import FTSStore
@@ -21,6 +26,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# How often the shared connection folds the WAL back into the database file
+_CHECKPOINT_INTERVAL_S = 300
+
 
 class HybridMemory:
     """Unified interface to the 4-layer adaptive neural memory system.
@@ -34,8 +42,13 @@ class HybridMemory:
 
     def __init__(self) -> None:
         self.working = WorkingMemory()
-        self.episodic = EpisodicMemory()
-        self.fts = FTSStore()
+        # Episodes and FTS entries are written together on every turn; one
+        # connection means one page cache and no lock hand-off between them.
+        # It is opened in initialize() and belongs to this instance alone.
+        self._db_path = Path(config.get("memory.sqlite_path", "./data/nexus.db"))
+        self._conn: sqlite3.Connection | None = None
+        self.episodic = EpisodicMemory(self._db_path)
+        self.fts = FTSStore(self._db_path)
         self.vector = VectorStore()
         self.kg = KnowledgeGraph()
         self.procedural = ProceduralMemory()
@@ -43,9 +56,11 @@ class HybridMemory:
         self.session = SessionManager()
         self.experience = ExperienceMemory()
         self.pyramid: PyramidMemory | None = None
+        self._checkpoint_task: asyncio.Task | None = None
 
     async def initialize(self) -> None:
         """Initialize all memory layers."""
+        self._open_sqlite()
         await self.episodic.initialize()
         await self.fts.initialize()
         await self.vector.initialize()
@@ -53,8 +68,26 @@ class HybridMemory:
         await self.procedural.initialize()
         await self.session.initialize()
         await self.experience.initialize()
+        self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
         logger.info("All memory layers initialized")
 
+    def _open_sqlite(self) -> None:
+        """Open this instance's connection and hand it to the episodic and FTS stores."""
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite_tuning.connect(self._db_path)
+        self.episodic = EpisodicMemory(self._db_path, conn=self._conn)
+        self.fts = FTSStore(self._db_path, conn=self._conn)
+
+    async def _checkpoint_loop(self) -> None:
+        """Periodically truncate the WAL so it does not grow without bound."""
+        while True:
+            await asyncio.sleep(_CHECKPOINT_INTERVAL_S)
+            try:
+                await self.fts.flush()  # pending access counts, so no write is left open
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.warning("WAL checkpoint failed: %s", e)
+
     async def init_pyramid(
         self,
         session_manager: SessionManager,
@@ -77,85 +110,113 @@ class HybridMemory:
 
     async def search(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
         """Search across all memory layers and merge results."""
-        results = []
-
         # Layer 1: Working memory (instant)
-        wm_results = self.working.search(query)
-        for key, content, attention in wm_results:
-            results.append({
+        results = [
+            {
                 "content": str(content),
                 "source": "working_memory",
                 "score": attention,
                 "timestamp": 0,
-            })
+            }
+            for key, content, attention in self.working.search(query)
+        ]
+
+        # Layers 2-3c run concurrently, so a slow embedding call does not hold
+        # up the local stores; each helper logs and swallows its own errors
+        for layer_results in await asyncio.gather(
+            self._search_episodic(query, top_k),
+            self._search_fts(query, top_k),
+            self._search_vector(query, top_k),
+            self._search_kg(query, top_k),
+        ):
+            results.extend(layer_results)
 
-        # Layer 2: Episodic memory
+        # Apply temporal ranking
+        results = self.temporal.rank_results(results)
+
+        # Deduplicate on the full content (str caches its own hash, so no slice
+        # is allocated); results are sorted, so the best-ranked copy is the one kept
+        seen: set[str] = set()
+        unique = []
+        for r in results:
+            content = r["content"]
+            if content not in seen:
+                seen.add(content)
+                unique.append(r)
+                if len(unique) == top_k:
+                    break
+        return unique
+
+    async def _search_episodic(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Layer 2: Episodic memory."""
         try:
             episodes = await self.episodic.search(query, limit=top_k)
-            for ep in episodes:
-                results.append({
-                    "content": f"Q: {ep.query}\nA: {ep.response}",
-                    "source": "episodic",
-                    "score": ep.confidence,
-                    "timestamp": ep.timestamp,
-                })
         except Exception as e:
             logger.warning(f"Episodic search error: {e}")
+            return []
+        return [
+            {
+                "content": f"Q: {ep.query}\nA: {ep.response}",
+                "source": "episodic",
+                "score": ep.confidence,
+                "timestamp": ep.timestamp,
+            }
+            for ep in episodes
+        ]
 
-        # Layer 3a: FTS keyword search
+    async def _search_fts(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Layer 3a: FTS keyword search."""
         try:
             fts_results = await self.fts.search(query, limit=top_k)
-            for item in fts_results:
-                results.append({
-                    "content": item.get("content", ""),
-                    "source": "fts",
-                    "score": item.get("score", 0.5),
-                    "timestamp": item.get("timestamp", 0),
-                })
         except Exception as e:
             logger.warning(f"FTS search error: {e}")
+            return []
+        return [
+            {
+                "content": item.get("content", ""),
+                "source": "fts",
+                "score": item.get("score", 0.5),
+                "timestamp": item.get("timestamp", 0),
+            }
+            for item in fts_results
+        ]
 
-        # Layer 3b: Vector similarity search
+    async def _search_vector(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Layer 3b: Vector similarity search."""
         try:
             vec_results = await self.vector.search(query, top_k=top_k)
-            for item in vec_results:
-                results.append({
-                    "content": item.get("content", ""),
-                    "source": "vector",
-                    "score": 1.0 - item.get("distance", 0.5),
-                    "timestamp": item.get("metadata", {}).get("timestamp", 0),
-                })
         except Exception as e:
             logger.warning(f"Vector search error: {e}")
+            return []
+        return [
+            {
+                "content": item.get("content", ""),
+                "source": "vector",
+                "score": 1.0 - item.get("distance", 0.5),
+                "timestamp": item.get("metadata", {}).get("timestamp", 0),
+            }
+            for item in vec_results
+        ]
 
-        # Layer 3c: Knowledge graph
+    async def _search_kg(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Layer 3c: Knowledge graph."""
         try:
             kg_results = await self.kg.search(query, limit=top_k)
-            for item in kg_results:
-                content_parts = [f"Concept: {item['label']}"]
-                if item.get("connections"):
-                    content_parts.append(f"Related: {', '.join(item['connections'][:5])}")
-                results.append({
-                    "content": " | ".join(content_parts),
-                    "source": "knowledge_graph",
-                    "score": item.get("activation", 0.5),
-                    "timestamp": 0,
-                })
         except Exception as e:
             logger.warning(f"KG search error: {e}")
-
-        # Apply temporal ranking
-        results = self.temporal.rank_results(results)
-
-        # Deduplicate and return top results
-        seen = set()
-        unique = []
-        for r in results:
-            key = r["content"][:100]
-            if key not in seen:
-                seen.add(key)
-                unique.append(r)
-        return unique[:top_k]
+            return []
+        results = []
+        for item in kg_results:
+            content_parts = [f"Concept: {item['label']}"]
+            if item.get("connections"):
+                content_parts.append(f"Related: {', '.join(item['connections'][:5])}")
+            results.append({
+                "content": " | ".join(content_parts),
+                "source": "knowledge_graph",
+                "score": item.get("activation", 0.5),
+                "timestamp": 0,
+            })
+        return results
 
     async def get_procedural(self, query: str) -> str | None:
         """Check procedural memory cache. Returns cached response or None."""
@@ -188,6 +249,33 @@ class HybridMemory:
             metadata={"type": "interaction"},
         )
 
+    async def store_interactions(
+        self, interactions: list[tuple[str, str, dict | None]]
+    ) -> None:
+        """Store several (query, response, metadata) interactions.
+
+        The SQLite layers take the whole batch in one transaction each instead of
+        one commit per interaction per layer.
+        """
+        if not interactions:
+            return
+        last_query, last_response, _ = interactions[-1]
+        self.working.store("last_query", last_query)
+        self.working.store("last_response", last_response[:500])
+
+        await self.episodic.store_many(
+            {"query": q, "response": r, "metadata": m} for q, r, m in interactions
+        )
+        await self.fts.store_many(
+            {"title": q[:100], "content": r, "category": "interaction", "source": "conversation"}
+            for q, r, _ in interactions
+        )
+        # Embeddings are one API call each; issue them together
+        await asyncio.gather(*(
+            self.vector.store(f"Q: {q}\nA: {r[:500]}", metadata={"type": "interaction"})
+            for q, r, _ in interactions
+        ))
+
     async def store_knowledge(self, title: str, content: str, category: str = "") -> None:
         """Store a piece of knowledge in semantic memory layers."""
         await self.fts.store(title=title, content=content, category=category)
@@ -211,6 +299,12 @@ class HybridMemory:
 
     async def close(self) -> None:
         """Close all memory connections."""
+        if self._checkpoint_task and not self._checkpoint_task.done():
+            self._checkpoint_task.cancel()
+            try:
+                await self._checkpoint_task
+            except asyncio.CancelledError:
+                pass
         if self.pyramid is not None:
             try:
                 await self.pyramid.close()
@@ -218,6 +312,9 @@ class HybridMemory:
                 logger.warning("PyramidMemory close error: %s", e)
         await self.episodic.close()
         await self.fts.close()
+        if self._conn is not None:
+            sqlite_tuning.close(self._conn)
+            self._conn = None
         await self.vector.close()
         await self.kg.close()
         await self.procedural.close()
@@ -13,9 +13,19 @@ from typing import Any
 import networkx as nx
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 logger = logging.getLogger(__name__)
 
+_INSERT_EDGE_SQL = (
+    "INSERT OR REPLACE INTO kg_edges (source, target, relation, weight, co_activation_count, created_at) "
+    "VALUES (?, ?, ?, ?, 0, ?)"
+)
+_HEBBIAN_SQL = (
+    "UPDATE kg_edges SET weight = ?, co_activation_count = co_activation_count + 1 "
+    "WHERE source = ? AND target = ?"
+)
+
 
 class KnowledgeGraph:
     """Graph-based knowledge store with Hebbian weight updates.
@@ -29,7 +39,7 @@ class KnowledgeGraph:
 
     async def initialize(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn = sqlite_tuning.connect(self.db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS kg_nodes (
                 id TEXT PRIMARY KEY,
@@ -82,30 +92,34 @@ class KnowledgeGraph:
     async def add_relation(self, source: str, target: str, relation: str = "related_to", weight: float = 1.0) -> None:
         """Add a directed edge between concepts."""
         now = time.time()
-        self._conn.execute(
-            "INSERT OR REPLACE INTO kg_edges (source, target, relation, weight, co_activation_count, created_at) "
-            "VALUES (?, ?, ?, ?, 0, ?)",
-            (source, target, relation, weight, now),
-        )
+        self._conn.execute(_INSERT_EDGE_SQL, (source, target, relation, weight, now))
         self._conn.commit()
         self.graph.add_edge(source, target, relation=relation, weight=weight, co_activations=0)
 
     async def hebbian_update(self, concepts: list[str]) -> None:
         """Hebbian learning: strengthen connections between co-activated concepts.
         'Neurons that fire together wire together.' Free operation."""
+        # The loop only touches the in-memory graph; the rows are written after
+        # it in two executemany batches and one commit
+        now = time.time()
+        inserts = []
+        updates = []
         for i, c1 in enumerate(concepts):
             for c2 in concepts[i + 1:]:
                 if self.graph.has_edge(c1, c2):
                     data = self.graph[c1][c2]
                     data["weight"] = min(10.0, data["weight"] + self.learning_rate)
                     data["co_activations"] = data.get("co_activations", 0) + 1
-                    self._conn.execute(
-                        "UPDATE kg_edges SET weight = ?, co_activation_count = co_activation_count + 1 "
-                        "WHERE source = ? AND target = ?",
-                        (data["weight"], c1, c2),
-                    )
+                    updates.append((data["weight"], c1, c2))
                 elif c1 in self.graph and c2 in self.graph:
-                    await self.add_relation(c1, c2, "co_activated", self.learning_rate)
+                    self.graph.add_edge(c1, c2, relation="co_activated",
+                                        weight=self.learning_rate, co_activations=0)
+                    inserts.append((c1, c2, "co_activated", self.learning_rate, now))
+        if not (inserts or updates):
+            return
+        # Inserts first: a pair repeated in `concepts` is created, then strengthened
+        self._conn.executemany(_INSERT_EDGE_SQL, inserts)
+        self._conn.executemany(_HEBBIAN_SQL, updates)
         self._conn.commit()
 
     async def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
@@ -137,20 +151,19 @@ class KnowledgeGraph:
     async def decay(self, rate: float | None = None) -> int:
         """Apply decay to all node activations. Returns count of removed nodes."""
         r = rate or config.get("memory.semantic_decay_rate", 0.01)
-        removed = 0
+        keep = 1.0 - r
         to_remove = []
         for node_id, data in self.graph.nodes(data=True):
-            data["activation"] = data.get("activation", 1.0) * (1.0 - r)
-            if data["activation"] < 0.01:
+            activation = data["activation"] = data.get("activation", 1.0) * keep
+            if activation < 0.01:
                 to_remove.append(node_id)
-        for node_id in to_remove:
-            self.graph.remove_node(node_id)
-            self._conn.execute("DELETE FROM kg_nodes WHERE id = ?", (node_id,))
-            self._conn.execute("DELETE FROM kg_edges WHERE source = ? OR target = ?", (node_id, node_id))
-            removed += 1
         if to_remove:
+            self.graph.remove_nodes_from(to_remove)
+            params = [(node_id,) for node_id in to_remove]
+            self._conn.executemany("DELETE FROM kg_nodes WHERE id = ?", params)
+            self._conn.executemany("DELETE FROM kg_edges WHERE source = ?1 OR target = ?1", params)
             self._conn.commit()
-        return removed
+        return len(to_remove)
 
     async def get_random_pair(self) -> tuple[str, str] | None:
         """Get a random pair of concepts for the novelty engine."""
@@ -175,4 +188,4 @@ class KnowledgeGraph:
 
     async def close(self) -> None:
         if self._conn:
-            self._conn.close()
+            sqlite_tuning.close(self._conn)
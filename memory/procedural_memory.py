@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Any
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 
 class ProceduralMemory:
@@ -25,7 +26,7 @@ class ProceduralMemory:
 
     async def initialize(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn = sqlite_tuning.connect(self.db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS procedures (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -173,4 +174,4 @@ class ProceduralMemory:
 
     async def close(self) -> None:
         if self._conn:
-            self._conn.close()
+            sqlite_tuning.close(self._conn)
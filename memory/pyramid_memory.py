@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 if TYPE_CHECKING:
     from nexus.memory.session import SessionManager
@@ -103,7 +104,7 @@ class PyramidMemory:
 
     def _create_tables(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        conn = sqlite3.connect(str(self._db_path))
+        conn = sqlite_tuning.connect(self._db_path)
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS tier1_daily (
                 date       TEXT PRIMARY KEY,
@@ -129,7 +130,7 @@ class PyramidMemory:
         conn.commit()
         conn.close()
         # Keep a long-lived connection for reads
-        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn = sqlite_tuning.connect(self._db_path, check_same_thread=False)
 
     def start_scheduler(self) -> None:
         """Launch the asyncio background task that runs _compression_cycle() periodically."""
@@ -158,7 +159,7 @@ class PyramidMemory:
             except asyncio.CancelledError:
                 pass
         if self._conn:
-            await asyncio.to_thread(self._conn.close)
+            await asyncio.to_thread(sqlite_tuning.close, self._conn)
             self._conn = None
         logger.info("PyramidMemory closed")
 
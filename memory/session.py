@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import sqlite3
@@ -11,9 +12,18 @@ from pathlib import Path
 from typing import Any
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 logger = logging.getLogger(__name__)
 
+_INSERT_MESSAGE_SQL = (
+    "INSERT INTO sessions (session_id, role, content, timestamp, metadata) VALUES (?, ?, ?, ?, ?)"
+)
+# add_message() write-behind: buffered rows are written once this many are
+# waiting, or this long after the first one
+_WRITE_BATCH = 32
+_WRITE_DELAY_S = 0.2
+
 
 @dataclass
 class Message:
@@ -30,10 +40,12 @@ class SessionManager:
         self.db_path = db_path or Path(config.get("memory.sqlite_path", "./data/nexus.db"))
         self._conn: sqlite3.Connection | None = None
         self._sessions: dict[str, list[Message]] = {}
+        self._write_buf: list[tuple] = []  # rows for _INSERT_MESSAGE_SQL
+        self._flush_handle: asyncio.TimerHandle | None = None
 
     async def initialize(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn = sqlite_tuning.connect(self.db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -53,17 +65,33 @@ class SessionManager:
             self._sessions[session_id] = []
         self._sessions[session_id].append(msg)
 
-        self._conn.execute(
-            "INSERT INTO sessions (session_id, role, content, timestamp, metadata) VALUES (?, ?, ?, ?, ?)",
-            (session_id, role, content, msg.timestamp, json.dumps(msg.metadata)),
-        )
-        self._conn.commit()
+        # The in-memory session above serves reads; the row itself is written
+        # with the next batch
+        self._write_buf.append((session_id, role, content, msg.timestamp, json.dumps(msg.metadata)))
+        if len(self._write_buf) >= _WRITE_BATCH:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(_WRITE_DELAY_S, self._flush)
+
+    async def flush(self) -> None:
+        """Write any buffered messages now."""
+        self._flush()
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._write_buf:
+            self._conn.executemany(_INSERT_MESSAGE_SQL, self._write_buf)
+            self._conn.commit()
+            self._write_buf.clear()
 
     async def get_history(self, session_id: str, limit: int = 20) -> list[Message]:
         """Get recent conversation history."""
         if session_id in self._sessions:
             return self._sessions[session_id][-limit:]
 
+        self._flush()
         rows = self._conn.execute(
             "SELECT role, content, timestamp, metadata FROM sessions "
             "WHERE session_id = ? ORDER BY timestamp DESC LIMIT ?",
@@ -84,6 +112,7 @@ class SessionManager:
 
     async def clear_session(self, session_id: str) -> None:
         self._sessions.pop(session_id, None)
+        self._flush()
         self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
         self._conn.commit()
 
@@ -93,6 +122,7 @@ class SessionManager:
         Call this on startup or periodically to keep the DB from growing forever.
         """
         cutoff = time.time() - (keep_days * 86400)
+        self._flush()
         result = self._conn.execute(
             "DELETE FROM sessions WHERE timestamp < ?", (cutoff,)
         )
@@ -109,6 +139,7 @@ class SessionManager:
 
         Prevents a single long-running session from consuming unbounded space.
         """
+        self._flush()
         rows = self._conn.execute(
             "SELECT id FROM sessions WHERE session_id = ? ORDER BY timestamp DESC LIMIT -1 OFFSET ?",
             (session_id, keep_last),
@@ -123,4 +154,5 @@ class SessionManager:
 
     async def close(self) -> None:
         if self._conn:
-            self._conn.close()
+            self._flush()
+            sqlite_tuning.close(self._conn)
@@ -0,0 +1,43 @@
+"""Shared SQLite connection setup for the memory stores and skill databases.
+
+Stores that open their own connection to the same database file all need the
+same journal and locking settings to cooperate. Stores that can share one are
+handed a connection by their owner (see HybridMemory).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+# Applied in order; journal_mode must be switched before anything is written.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",     # readers never block the writer; commits append to the log
+    "PRAGMA synchronous=NORMAL",   # fsync at checkpoints, not on every commit (safe under WAL)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB of address space, only touched pages are resident
+    "PRAGMA cache_size=-16384",    # 16 MiB page cache per connection
+    "PRAGMA busy_timeout=5000",    # wait for another connection's write lock instead of failing
+)
+
+
+def tune(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the shared pragmas to an open connection."""
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def connect(db_path: Path | str, **kwargs) -> sqlite3.Connection:
+    """sqlite3.connect() with the shared pragmas applied."""
+    return tune(sqlite3.connect(str(db_path), **kwargs))
+
+
+def close(conn: sqlite3.Connection) -> None:
+    """Close a connection, first letting SQLite refresh any stale planner statistics."""
+    try:
+        conn.execute("PRAGMA optimize")  # cheap: only analyzes tables whose stats drifted
+    except sqlite3.Error:
+        pass  # e.g. database locked; closing matters more
+    conn.close()
+
@@ -21,6 +21,7 @@ from pathlib import Path
 from typing import Any
 
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +62,7 @@ class VectorStore:
             from google import genai
             self._client = genai.Client(api_key=api_key)
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
-            self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+            self._conn = sqlite_tuning.connect(self._db_path, check_same_thread=False)
             self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS vectors (
                     id        TEXT PRIMARY KEY,
@@ -184,6 +185,6 @@ class VectorStore:
     async def close(self) -> None:
         if self._conn:
             try:
-                self._conn.close()
+                sqlite_tuning.close(self._conn)
             except Exception:
                 pass
@@ -82,9 +82,10 @@ class WorkingMemory:
 
     def decay_all(self, rate: float = 0.05) -> None:
         """Apply decay to all slots (called periodically). Free operation."""
+        keep = 1.0 - rate
         to_remove = []
         for key, slot in self._slots.items():
-            slot.attention_weight *= (1.0 - rate)
+            slot.attention_weight *= keep
             if slot.attention_weight < 0.01:
                 to_remove.append(key)
         for key in to_remove:
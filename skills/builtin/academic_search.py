@@ -181,8 +181,9 @@ class AcademicSearchSkill(BaseSkill):
 
     async def _save_to_notes(self, query: str, session_id: str, context: dict[str, Any]) -> SkillResult:
         """Save last search results to study_notes DB."""
-        import sqlite3, time
+        import time
         from nexus import config
+        from nexus.memory import sqlite_tuning
 
         cached = self._last_results.get(session_id, [])
         if not cached:
@@ -204,7 +205,8 @@ class AcademicSearchSkill(BaseSkill):
 
         db_path = config.data_dir() / "study_notes.db"
         try:
-            conn = sqlite3.connect(str(db_path))
+            # StudyNotesSkill keeps its own connection open on this file
+            conn = sqlite_tuning.connect(db_path)
             conn.execute("""CREATE TABLE IF NOT EXISTS notes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 subject TEXT NOT NULL, chapter TEXT DEFAULT '',
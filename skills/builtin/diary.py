@@ -14,6 +14,7 @@ from typing import Any
 
 from nexus.skills.skill_base import BaseSkill, SkillResult
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 
 class DiarySkill(BaseSkill):
@@ -47,7 +48,7 @@ class DiarySkill(BaseSkill):
 
     async def initialize(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path))
+        self._conn = sqlite_tuning.connect(self._db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS diary (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -18,6 +18,9 @@ _WMO = {
     95: "雷雨⛈️", 99: "強冰雹雷雨⛈️",
 }
 
+_WEEKDAYS_ZH = ("一", "二", "三", "四", "五", "六", "日")
+_WEEKDAYS_EN = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
 _RSS_FEEDS = [
     ("BBC World",  "https://feeds.bbci.co.uk/news/world/rss.xml"),
     ("TechCrunch", "https://techcrunch.com/feed/"),
@@ -42,8 +45,7 @@ class MorningReportSkill(BaseSkill):
 
     async def execute(self, query: str, context: dict[str, Any]) -> SkillResult:
         now = datetime.now()
-        weekdays = ["一", "二", "三", "四", "五", "六", "日"]
-        date_str = f"{now.month}月{now.day}日（星期{weekdays[now.weekday()]}）"
+        date_str = f"{now.month}月{now.day}日（星期{_WEEKDAYS_ZH[now.weekday()]}）"
 
         weather_text  = await self._fetch_weather()
         news_text     = await self._fetch_news()
@@ -133,9 +135,9 @@ class MorningReportSkill(BaseSkill):
                 return ""
             data = json.loads(path.read_text(encoding="utf-8"))
             now = datetime.now()
-            weekdays_en = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
-            today = weekdays_en[now.weekday()]
-            is_weekday = now.weekday() < 5
+            wd = now.weekday()
+            today = _WEEKDAYS_EN[wd]
+            is_weekday = wd < 5
             lines = []
             for s in data:
                 if not s.get("enabled", True):
@@ -11,6 +11,7 @@ from typing import Any
 
 from nexus.skills.skill_base import BaseSkill, SkillResult
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 
 class ReminderSkill(BaseSkill):
@@ -45,7 +46,7 @@ class ReminderSkill(BaseSkill):
 
     async def initialize(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path))
+        self._conn = sqlite_tuning.connect(self._db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS reminders (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
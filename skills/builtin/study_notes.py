@@ -9,6 +9,7 @@ from typing import Any
 
 from nexus.skills.skill_base import BaseSkill, SkillResult
 from nexus import config
+from nexus.memory import sqlite_tuning
 
 
 # Default PT subject categories
@@ -69,7 +70,7 @@ class StudyNotesSkill(BaseSkill):
 
     async def initialize(self) -> None:
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path))
+        self._conn = sqlite_tuning.connect(self._db_path)
         self._conn.execute("""
             CREATE TABLE IF NOT EXISTS notes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
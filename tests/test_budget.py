@@ -83,3 +83,14 @@ def test_budget_status(budget):
     assert "daily_limit" in status
     assert "usage_ratio" in status
     assert status["daily_limit"] == 1000
+
+
+@pytest.mark.asyncio
+async def test_budget_status_refreshes_on_consume(budget):
+    first = budget.get_status()
+    assert budget.get_status() is first  # reused while nothing changes
+    await budget.consume_tokens(50, source="test")
+    status = budget.get_status()
+    assert status is not first
+    assert status["tokens_used"] == 50
+    assert status["request_count"] == first["request_count"] + 1
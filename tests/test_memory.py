@@ -95,6 +95,76 @@ class TestEpisodicMemory:
         assert len(recent) == 2
         await em.close()
 
+    @pytest.mark.asyncio
+    async def test_search_substrings(self, config_mock, temp_dir):
+        from nexus.memory.episodic_memory import EpisodicMemory
+        em = EpisodicMemory(db_path=temp_dir / "test.db")
+        await em.initialize()
+        await em.store("今天台北天氣如何", "晴天，氣溫 25 度")
+        await em.store("Explain Python decorators", "A decorator wraps a function.", lesson='Use "functools.wraps"')
+        assert [e.query for e in await em.search("台北天氣")] == ["今天台北天氣如何"]
+        assert len(await em.search("python")) == 1  # case-insensitive, like LIKE
+        assert len(await em.search("wraps a func")) == 1
+        assert len(await em.search('"functools')) == 1
+        assert len(await em.search("天")) == 1  # too short for trigrams
+        assert await em.search("nothing like this") == []
+        await em.close()
+
+    @pytest.mark.asyncio
+    async def test_metadata_round_trip(self, config_mock, temp_dir):
+        from nexus.memory.episodic_memory import EpisodicMemory
+        em = EpisodicMemory(db_path=temp_dir / "test.db")
+        await em.initialize()
+        await em.store("plain", "no metadata")
+        await em.store("tagged", "with metadata", metadata={"channel": "web", 1: "x"})
+        raw = dict(em._conn.execute("SELECT query, metadata FROM episodes").fetchall())
+        assert raw["plain"] == ""
+        by_query = {ep.query: ep.metadata for ep in await em.get_recent()}
+        assert by_query == {"plain": {}, "tagged": {"channel": "web", "1": "x"}}
+        await em.close()
+
+    @pytest.mark.asyncio
+    async def test_extract_lesson_cached(self, config_mock, temp_dir):
+        from unittest.mock import AsyncMock
+        from nexus.memory.episodic_memory import EpisodicMemory
+        em = EpisodicMemory(db_path=temp_dir / "test.db")
+        await em.initialize()
+        llm = AsyncMock(return_value="Prefer sorted() for lists.")
+        assert await em.extract_lesson("How to sort?", "Use sorted().", llm) == "Prefer sorted() for lists."
+        assert await em.extract_lesson("How to sort?", "Use sorted().", llm) == "Prefer sorted() for lists."
+        assert llm.await_count == 1
+        await em.extract_lesson("How to reverse?", "Use reversed().", llm)
+        assert llm.await_count == 2
+        await em.close()
+
+    @pytest.mark.asyncio
+    async def test_store_trims_limit_periodically(self, config_mock, temp_dir):
+        from nexus.memory.episodic_memory import EpisodicMemory, _TRIM_EVERY
+        em = EpisodicMemory(db_path=temp_dir / "test.db", max_entries=3)
+        await em.initialize()
+        for i in range(_TRIM_EVERY - 1):
+            await em.store(f"Q{i}", f"A{i}")
+        assert len(await em.get_recent(limit=100)) == _TRIM_EVERY - 1
+        await em.store("last", "kept")
+        recent = await em.get_recent(limit=100)
+        assert len(recent) == 3 and recent[0].query == "last"
+        await em.close()
+
+    @pytest.mark.asyncio
+    async def test_store_many_respects_limit(self, config_mock, temp_dir):
+        from nexus.memory.episodic_memory import EpisodicMemory
+        em = EpisodicMemory(db_path=temp_dir / "test.db", max_entries=3)
+        await em.initialize()
+        stored = await em.store_many(
+            {"query": f"Q{i}", "response": f"A{i}", "lesson": "L" if i == 4 else ""}
+            for i in range(5)
+        )
+        assert stored == 5
+        assert len(await em.get_recent(limit=10)) == 3
+        assert await em.get_lessons() == ["L"]
+        assert await em.store_many([]) == 0
+        await em.close()
+
 
 # ── Knowledge Graph Tests ──
 class TestKnowledgeGraph:
@@ -122,6 +192,155 @@ class TestKnowledgeGraph:
         await kg.close()
 
 
+    @pytest.mark.asyncio
+    async def test_hebbian_update_persists_batch(self, config_mock, temp_dir):
+        from nexus.memory.knowledge_graph import KnowledgeGraph
+        kg = KnowledgeGraph(db_path=temp_dir / "test.db")
+        await kg.initialize()
+        for cid in ("ai", "ml", "dl"):
+            await kg.add_concept(cid, cid.upper())
+        await kg.add_relation("ai", "ml", "includes")
+        await kg.hebbian_update(["ai", "ml", "dl", "dl"])  # ml-dl created, then strengthened
+        await kg.close()
+        reloaded = KnowledgeGraph(db_path=temp_dir / "test.db")
+        await reloaded.initialize()
+        assert reloaded.graph["ai"]["ml"]["weight"] == pytest.approx(1.1)
+        assert reloaded.graph["ai"]["ml"]["co_activations"] == 1
+        edge = reloaded.graph["ml"]["dl"]
+        assert edge["relation"] == "co_activated" and edge["co_activations"] == 1
+        assert edge["weight"] == pytest.approx(0.2)
+        await reloaded.close()
+
+# ── FTS Store Tests ──
+class TestFTSStore:
+    @pytest.mark.asyncio
+    async def test_search_ranks_and_limits(self, config_mock, temp_dir):
+        from nexus.memory.fts_store import FTSStore
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        await fts.store("Python", "python python python packaging", source="a")
+        await fts.store("Misc", "a note that mentions python once", source="b")
+        await fts.store("Rust", "ownership and borrowing")
+        results = await fts.search("python", limit=5)
+        assert [r["title"] for r in results] == ["Python", "Misc"]
+        assert results[0]["source"] == "a"
+        assert results[0]["score"] >= results[1]["score"]
+        assert len(await fts.search("python", limit=1)) == 1
+        await fts.close()
+
+    @pytest.mark.asyncio
+    async def test_store_many(self, config_mock, temp_dir):
+        from nexus.memory.fts_store import FTSStore
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        stored = await fts.store_many([
+            {"title": "One", "content": "alpha entry", "source": "batch"},
+            {"title": "Two", "content": "beta entry", "metadata": {"k": 1}},
+        ])
+        assert stored == 2
+        results = await fts.search("beta")
+        assert [r["title"] for r in results] == ["Two"]
+        assert await fts.count() == 2
+        await fts.close()
+
+    @pytest.mark.asyncio
+    async def test_search_weights_title_matches(self, config_mock, temp_dir):
+        from nexus.memory.fts_store import FTSStore
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        await fts.store("asyncio", "event loop basics")
+        await fts.store("Cooking notes", "asyncio mentioned once in passing here")
+        results = await fts.search("asyncio")
+        assert [r["title"] for r in results] == ["asyncio", "Cooking notes"]
+        assert all(r["score"] > 0 for r in results)  # ranked by FTS, not the LIKE fallback
+        await fts.close()
+        flat = FTSStore(db_path=temp_dir / "test.db", weights=(1.0, 1.0, 1.0, 1.0))
+        await flat.initialize()
+        assert len(await flat.search("asyncio")) == 2
+        await flat.close()
+
+    @pytest.mark.asyncio
+    async def test_access_counts_written_with_next_write(self, config_mock, temp_dir):
+        from nexus.memory.fts_store import FTSStore
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        rowid = await fts.store("Python", "python notes")
+        await fts.search("python")
+        await fts.search("python")
+        hits = "SELECT access_count FROM knowledge WHERE rowid = ?"
+        assert fts._conn.execute(hits, (rowid,)).fetchone()[0] == 0
+        await fts.store("Other", "unrelated")
+        assert fts._conn.execute(hits, (rowid,)).fetchone()[0] == 2
+        await fts.close()
+
+    @pytest.mark.asyncio
+    async def test_store_leaves_no_open_write(self, config_mock, temp_dir):
+        import sqlite3
+        from nexus.memory.fts_store import FTSStore
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        await fts.store("first", "committed row")
+        other = sqlite3.connect(temp_dir / "test.db", timeout=0)  # fail fast if locked
+        assert other.execute("SELECT COUNT(*) FROM knowledge").fetchone()[0] == 1
+        other.execute("CREATE TABLE other_writer (x)")
+        other.commit()
+        other.close()
+        await fts.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_unindexes(self, config_mock, temp_dir):
+        from nexus.memory.fts_store import FTSStore
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        rowid = await fts.store("Python", "python notes")
+        await fts.delete(rowid)
+        assert await fts.search("python") == []
+        assert await fts.count() == 0
+        await fts.close()
+
+    @pytest.mark.asyncio
+    async def test_migrates_legacy_layout(self, config_mock, temp_dir):
+        import sqlite3
+        from nexus.memory.fts_store import FTSStore
+        conn = sqlite3.connect(temp_dir / "test.db")
+        conn.execute("CREATE VIRTUAL TABLE knowledge_fts USING fts5(title, content, category, tags, tokenize='unicode61')")
+        conn.execute("CREATE TABLE knowledge_meta (rowid INTEGER PRIMARY KEY, source TEXT DEFAULT '', "
+                     "timestamp REAL NOT NULL, access_count INTEGER DEFAULT 0, metadata TEXT DEFAULT '{}')")
+        conn.execute("INSERT INTO knowledge_fts (rowid, title, content, category, tags) "
+                     "VALUES (7, 'Old', 'legacy python entry', '', '')")
+        conn.execute("INSERT INTO knowledge_meta (rowid, source, timestamp) VALUES (7, 'import', 1.0)")
+        conn.commit()
+        conn.close()
+
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await fts.initialize()
+        results = await fts.search("python")
+        assert [(r["id"], r["title"], r["source"]) for r in results] == [(7, "Old", "import")]
+        await fts.store("New", "fresh python entry")
+        assert await fts.count() == 2
+        await fts.close()
+
+
+# ── SQLite Connection Tests ──
+class TestSqliteTuning:
+    def test_connect_applies_pragmas(self, temp_dir):
+        from nexus.memory import sqlite_tuning
+        conn = sqlite_tuning.connect(temp_dir / "tuned.db")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        conn.close()
+
+    def test_close_optimizes_and_closes(self, temp_dir):
+        import sqlite3
+        from nexus.memory import sqlite_tuning
+        conn = sqlite_tuning.connect(temp_dir / "tuned.db")
+        conn.execute("CREATE TABLE t (x)")
+        sqlite_tuning.close(conn)
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
 # ── Procedural Memory Tests ──
 class TestProceduralMemory:
     @pytest.mark.asyncio
@@ -143,3 +362,274 @@ class TestProceduralMemory:
         result = await pm.lookup("completely unrelated query xyz")
         assert result is None
         await pm.close()
+
+
+# ── Session Tests ──
+class TestSessionManager:
+    @pytest.mark.asyncio
+    async def test_messages_written_behind(self, config_mock, temp_dir):
+        from nexus.memory import session
+        sm = session.SessionManager(db_path=temp_dir / "test.db")
+        await sm.initialize()
+        stored = lambda: sm._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        await sm.add_message("s1", "user", "hello")
+        await sm.add_message("s1", "assistant", "hi there")
+        assert stored() == 0
+        assert [m.content for m in await sm.get_history("s1")] == ["hello", "hi there"]
+        await asyncio.sleep(session._WRITE_DELAY_S * 2)
+        assert stored() == 2
+        for i in range(session._WRITE_BATCH):
+            await sm.add_message("s2", "user", f"msg {i}")
+        assert stored() == 2 + session._WRITE_BATCH
+        await sm.add_message("s3", "user", "unflushed")
+        await sm.close()
+        reopened = session.SessionManager(db_path=temp_dir / "test.db")
+        await reopened.initialize()
+        assert [m.content for m in await reopened.get_history("s3")] == ["unflushed"]
+        await reopened.close()
+
+
+# ── Consolidation Tests ──
+class TestConsolidator:
+    @pytest.mark.asyncio
+    async def test_loop_keeps_cadence(self, config_mock):
+        from nexus.memory.consolidation import MemoryConsolidator
+        cons = MemoryConsolidator(memory=None)
+        cons.interval = 0.1
+        loop = asyncio.get_running_loop()
+        starts = []
+
+        async def slow_consolidate():
+            starts.append(loop.time())
+            await asyncio.sleep(0.06)  # work time must not push later runs back
+
+        cons.consolidate = slow_consolidate
+        await cons.start()
+        while len(starts) < 4:
+            await asyncio.sleep(0.01)
+        await cons.stop()
+        # On cadence this takes 0.3s; drifting sleep would need 3 * (0.1 + 0.06) = 0.48s
+        assert starts[3] - starts[0] < 0.4
+
+    @pytest.mark.asyncio
+    async def test_consolidate_stats(self, config_mock, temp_dir):
+        from types import SimpleNamespace
+        from nexus.memory.consolidation import MemoryConsolidator
+        from nexus.memory.episodic_memory import EpisodicMemory
+        from nexus.memory.fts_store import FTSStore
+        from nexus.memory.working_memory import WorkingMemory
+
+        episodic = EpisodicMemory(db_path=temp_dir / "test.db")
+        fts = FTSStore(db_path=temp_dir / "test.db")
+        await episodic.initialize()
+        await fts.initialize()
+        await episodic.store("q", "a", lesson="Prefer sorted() over manual loops")
+        await episodic.store("q2", "a2", lesson="short")
+        mem = SimpleNamespace(working=WorkingMemory(), kg=None, procedural=None,
+                              episodic=episodic, fts=fts)
+        stats = await MemoryConsolidator(mem).consolidate()
+        assert stats["lessons_promoted"] == 1
+        assert "kg_nodes_removed" not in stats
+        assert await fts.count() == 1
+        await episodic.close()
+        await fts.close()
+
+
+# ── Experience Memory Tests ──
+class TestExperienceMemory:
+    @pytest.mark.asyncio
+    async def test_record_many(self, config_mock, temp_dir):
+        from nexus.memory.experience_memory import ExperienceMemory
+        xm = ExperienceMemory()
+        await xm.initialize()
+        stored = await xm.record_many([
+            ("q1", "r1", "great, thanks", ""),
+            ("q2", "r2", "wrong answer", "too long"),
+            ("q2", "r2", "bad", ""),
+        ])
+        assert stored == 3
+        assert await xm.get_feedback_stats() == {"positive": 1, "negative": 2}
+        avoidance = await xm.get_avoidance_list()
+        assert len(avoidance) == 1 and avoidance[0]["count"] == 2
+        await xm.close()
+
+
+    @pytest.mark.asyncio
+    async def test_avoidance_duplicates_folded_on_upgrade(self, config_mock, temp_dir):
+        import sqlite3
+        from nexus.memory.experience_memory import ExperienceMemory
+        conn = sqlite3.connect(temp_dir / "experience.db")
+        conn.execute("""
+            CREATE TABLE avoidance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, pattern TEXT NOT NULL,
+                reason TEXT DEFAULT '', count INTEGER DEFAULT 1, timestamp REAL NOT NULL
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO avoidance (pattern, reason, count, timestamp) VALUES (?, ?, ?, 0)",
+            [("Response style for: q", "first", 2), ("Response style for: q", "second", 3),
+             ("Response style for: other", "", 1)],
+        )
+        conn.commit()
+        conn.close()
+        xm = ExperienceMemory()
+        await xm.initialize()
+        await xm.record_feedback("q", "r", "wrong")
+        avoidance = await xm.get_avoidance_list()
+        assert avoidance[0] == {"pattern": "Response style for: q", "reason": "first", "count": 6}
+        assert len(avoidance) == 2
+        await xm.close()
+
+    @pytest.mark.asyncio
+    async def test_preferences_cached_and_reloaded(self, config_mock, temp_dir):
+        from nexus.memory.experience_memory import ExperienceMemory
+        xm = ExperienceMemory()
+        await xm.initialize()
+        await xm.record_preference("format", "bullets", confidence=0.6)
+        await xm.record_preference("language", "zh-TW", confidence=0.9)
+        await xm.record_preference("format", "prose", confidence=0.5)
+        expected = {
+            "language": {"value": "zh-TW", "confidence": 0.9},
+            "format": {"value": "prose", "confidence": 0.5},
+        }
+        prefs = await xm.get_preferences()
+        assert prefs == expected and list(prefs) == ["language", "format"]
+        await xm.close()
+        reopened = ExperienceMemory()
+        await reopened.initialize()
+        assert await reopened.get_preferences() == expected
+        await reopened.close()
+
+# ── Hybrid Memory Tests ──
+class TestHybridMemory:
+    @pytest.mark.asyncio
+    async def test_search_merges_layers_and_survives_errors(self, config_mock):
+        from unittest.mock import AsyncMock, MagicMock
+        from nexus.memory.hybrid_store import HybridMemory
+        hm = HybridMemory()
+        hm.episodic = MagicMock(search=AsyncMock(side_effect=RuntimeError("db gone")))
+        hm.fts = MagicMock(search=AsyncMock(return_value=[{"content": "fts hit", "score": 0.9}]))
+        hm.vector = MagicMock(search=AsyncMock(return_value=[{"content": "vector hit", "distance": 0.2}]))
+        hm.kg = MagicMock(search=AsyncMock(return_value=[]))
+        results = await hm.search("anything", top_k=5)
+        assert {r["source"] for r in results} == {"fts", "vector"}
+
+    @pytest.mark.asyncio
+    async def test_search_dedups_on_full_content(self, config_mock):
+        from unittest.mock import AsyncMock, MagicMock
+        from nexus.memory.hybrid_store import HybridMemory
+        prefix = "Q: what is " + "x" * 100
+        hm = HybridMemory()
+        hm.episodic = MagicMock(search=AsyncMock(return_value=[]))
+        hm.fts = MagicMock(search=AsyncMock(return_value=[
+            {"content": prefix + " alpha", "score": 0.9},
+            {"content": prefix + " beta", "score": 0.8},
+        ]))
+        hm.vector = MagicMock(search=AsyncMock(return_value=[
+            {"content": prefix + " alpha", "distance": 0.5},
+        ]))
+        hm.kg = MagicMock(search=AsyncMock(return_value=[]))
+        results = await hm.search("what", top_k=5)
+        # Same 100-char prefix is not a duplicate; the better-scored alpha copy wins
+        assert sorted(r["content"][-5:] for r in results) == [" beta", "alpha"]
+        assert [r["source"] for r in results if r["content"].endswith("alpha")] == ["fts"]
+
+    @pytest.mark.asyncio
+    async def test_episodic_and_fts_share_connection(self, config_mock, temp_dir):
+        import sqlite3
+        from nexus.memory.hybrid_store import HybridMemory
+        hm = HybridMemory()
+        assert hm._conn is None  # nothing opened before initialize()
+        hm._open_sqlite()
+        conn = hm.episodic._conn
+        assert conn is hm._conn and hm.fts._conn is conn
+        await hm.episodic.initialize()
+        await hm.fts.initialize()
+        await hm.episodic.store("shared q", "shared r")
+        await hm.fts.store(title="shared", content="shared content")
+        await hm.episodic.close()  # does not close the shared connection
+        assert await hm.fts.count() == 1
+        await hm.fts.close()
+        conn.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    @pytest.mark.asyncio
+    async def test_instances_do_not_share_connection(self, config_mock, temp_dir):
+        from nexus.memory.hybrid_store import HybridMemory
+        first, second = HybridMemory(), HybridMemory()
+        first._open_sqlite()
+        second._open_sqlite()
+        assert first._conn is not second._conn
+        await second.fts.initialize()
+        await second.fts.store(title="kept", content="survives the other instance closing")
+        first._conn.close()
+        assert await second.fts.count() == 1
+        await second.fts.close()
+        second._conn.close()
+
+    @pytest.mark.asyncio
+    async def test_store_interactions_batches_sqlite_layers(self, config_mock, temp_dir):
+        from unittest.mock import AsyncMock, MagicMock
+        from nexus.memory.hybrid_store import HybridMemory
+        hm = HybridMemory()
+        hm._open_sqlite()
+        await hm.episodic.initialize()
+        await hm.fts.initialize()
+        hm.vector = MagicMock(store=AsyncMock())
+        await hm.store_interactions([
+            (f"question {i}", f"answer {i}", {"n": i}) for i in range(3)
+        ])
+        episodes = await hm.episodic.get_recent(limit=10)
+        assert sorted(e.query for e in episodes) == ["question 0", "question 1", "question 2"]
+        assert await hm.fts.count() == 3
+        assert hm.vector.store.await_count == 3
+        assert hm.working.retrieve("last_query") == "question 2"
+        assert hm.working.retrieve("last_response") == "answer 2"
+        assert hm._conn.in_transaction is False
+        await hm.episodic.close()
+        await hm.fts.close()
+        hm._conn.close()
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_loop_truncates_wal(self, config_mock, temp_dir):
+        from unittest.mock import patch
+        from nexus.memory import hybrid_store
+        hm = hybrid_store.HybridMemory()
+        hm._open_sqlite()
+        await hm.episodic.initialize()
+        await hm.fts.initialize()
+        await hm.fts.store("entry", "committed row still in the WAL")
+        wal = temp_dir / "test.db-wal"
+        assert wal.stat().st_size > 0
+        with patch.object(hybrid_store, "_CHECKPOINT_INTERVAL_S", 0.01):
+            task = asyncio.create_task(hm._checkpoint_loop())
+            await asyncio.sleep(0.05)
+            task.cancel()
+        assert wal.stat().st_size == 0
+        await hm.fts.close()
+        hm._conn.close()
+
+    @pytest.mark.asyncio
+    async def test_inject_context_cached_until_write(self, config_mock, temp_dir):
+        from nexus.memory.experience_memory import ExperienceMemory
+        xm = ExperienceMemory()
+        await xm.initialize()
+        assert await xm.inject_context() == ""
+        await xm.record_preference("language", "zh-TW")
+        ctx = await xm.inject_context()
+        assert "language: zh-TW" in ctx and "avoid" not in ctx.lower()
+        await xm.record_feedback("q", "r", "wrong")
+        ctx = await xm.inject_context()
+        assert ctx.startswith("User preferences:") and "Avoid: Response style for: q" in ctx
+        xm._conn.execute("DELETE FROM preferences")  # bypasses the write methods
+        assert await xm.inject_context() == ctx  # served from cache
+        await xm.close()
+
+    def test_classify_feedback(self, config_mock):
+        from nexus.memory.experience_memory import ExperienceMemory
+        xm = ExperienceMemory()
+        assert xm._classify_feedback("Great answer") == "positive"
+        assert xm._classify_feedback("這個錯了") == "negative"
+        assert xm._classify_feedback("please REDO") == "negative"
+        assert xm._classify_feedback("ok") == "neutral"
@@ -119,6 +119,31 @@ class TestAgentRegistry:
         assert ranked[0][0].name == "high"
         assert ranked[0][1] == 0.9
 
+    @pytest.mark.asyncio
+    async def test_with_hook(self):
+        from nexus.core.agent_registry import AgentRegistry
+        from nexus.core.agent_base import BaseAgent, AgentResult
+
+        class PlainAgent(BaseAgent):
+            name = "plain"
+
+            async def process(self, message, context):
+                return AgentResult(content="", confidence=0.0)
+
+        class LLMAgent(PlainAgent):
+            name = "llm_user"
+
+            def set_llm(self, llm):
+                self.llm = llm
+
+        registry = AgentRegistry()
+        registry.register(PlainAgent())
+        registry.register(LLMAgent())
+        assert [a.name for a in registry.with_hook("set_llm")] == ["llm_user"]
+        assert registry.with_hook("set_dependencies") == []
+        registry.unregister("llm_user")
+        assert registry.with_hook("set_llm") == []
+
 
 # ── Three Stream Tests ──
 class TestThreeStream:
@@ -163,6 +188,97 @@ class TestThreeStream:
 
         processor.unsubscribe(queue)
 
+    @pytest.mark.asyncio
+    async def test_emit_batch_preserves_order(self):
+        from nexus.core.three_stream import ThreeStreamProcessor, StreamEvent
+
+        processor = ThreeStreamProcessor()
+        queue = processor.subscribe()
+
+        await processor.emit_batch([
+            StreamEvent(stream="test", event_type="a", content="1"),
+            StreamEvent(stream="test", event_type="b", content="2"),
+        ])
+
+        assert queue.get_nowait().event_type == "a"
+        assert queue.get_nowait().event_type == "b"
+
+        processor.unsubscribe(queue)
+
+    def test_to_json_encodes_once(self):
+        import json
+        from nexus.core.three_stream import StreamEvent
+
+        event = StreamEvent(stream="think", event_type="hypothesis", content="你好", metadata={"n": 1})
+        frame = event.to_json()
+        assert json.loads(frame) == {
+            "type": "hypothesis", "stream": "think", "content": "你好", "metadata": {"n": 1},
+        }
+        assert event.to_json() is frame
+        assert event == StreamEvent(stream="think", event_type="hypothesis", content="你好", metadata={"n": 1})
+        with pytest.raises(AttributeError):  # FrozenInstanceError
+            event.content = "changed"
+
+    def test_to_json_tolerates_odd_metadata(self):
+        import json
+        from nexus.core.three_stream import StreamEvent
+
+        event = StreamEvent(stream="act", event_type="action", content="",
+                            metadata={1: "int key", "tags": {"a"}, "obj": object})
+        meta = json.loads(event.to_json())["metadata"]
+        assert meta["1"] == "int key"
+        assert meta["tags"] == ["a"]
+        assert meta["obj"] == str(object)
+
+
+# ── WebSocket Broadcast Tests ──
+class _StalledSocket:
+    """Fake WebSocket whose sends never complete."""
+
+    def __init__(self):
+        self.sent = []
+        self.close_code = None
+
+    async def send_text(self, text):
+        await asyncio.Event().wait()
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+class _LiveSocket(_StalledSocket):
+    async def send_text(self, text):
+        self.sent.append(text)
+
+
+class TestBroadcast:
+    @pytest.mark.asyncio
+    async def test_fan_out_drops_and_closes_stalled_client(self):
+        import nexus.main as app_main
+        from nexus.core.three_stream import StreamEvent
+
+        stalled, live = _StalledSocket(), _LiveSocket()
+        with patch.object(app_main, "_BROADCAST_TIMEOUT_S", 0.01), \
+                patch.object(app_main, "active_websockets", {stalled, live}):
+            await app_main._fan_out([StreamEvent(stream="think", event_type="hypothesis", content="x")])
+            await asyncio.gather(*app_main._close_tasks)
+            assert app_main.active_websockets == {live}
+        assert stalled.close_code == 1011
+        assert live.close_code is None and len(live.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_web_channel_broadcast_closes_stalled_client(self):
+        from nexus.gateway import web_channel
+
+        stalled, live = _StalledSocket(), _LiveSocket()
+        with patch.object(web_channel, "_BROADCAST_TIMEOUT_S", 0.01), \
+                patch.object(web_channel, "_active_ws", {stalled, live}):
+            await web_channel.broadcast({"type": "ping"})
+            await asyncio.gather(*web_channel._close_tasks)
+            assert web_channel._active_ws == {live}
+        assert stalled.close_code == 1011
+        assert live.close_code is None and len(live.sent) == 1
+
 
 # ── Verifier Tests ──
 class TestVerifier:
@@ -188,6 +304,19 @@ class TestVerifier:
         assert result.passed is False
         assert len(result.issues) > 0
 
+    @pytest.mark.asyncio
+    async def test_verify_fenced_json_with_commentary(self):
+        from nexus.core.verifier import Verifier
+
+        verifier = Verifier(confidence_threshold=0.7)
+        mock_llm = AsyncMock(return_value=(
+            '```json\n{"confidence": 0.8, "issues": [], "suggestion": ""}\n```\nLooks fine.'
+        ))
+
+        result = await verifier.verify("Q", "A", mock_llm)
+        assert result.passed is True
+        assert result.confidence == 0.8
+
     @pytest.mark.asyncio
     async def test_verify_handles_parse_error(self):
         from nexus.core.verifier import Verifier
@@ -264,6 +393,187 @@ class TestWorkflowEngine:
         assert engine._nodes["fail"].status == NodeStatus.FAILED
         assert engine._nodes["dep"].status == NodeStatus.SKIPPED
 
+    @pytest.mark.asyncio
+    async def test_diamond_and_transitive_skip(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode, NodeStatus
+
+        engine = WorkflowEngine()
+
+        async def ok(**kwargs):
+            return sorted(kwargs["dep_results"])
+
+        async def fail_step(**kwargs):
+            raise ValueError("intentional")
+
+        engine.add_node(WorkflowNode(id="root", name="Root", handler=ok))
+        engine.add_node(WorkflowNode(id="left", name="Left", handler=ok, depends_on=["root"]))
+        engine.add_node(WorkflowNode(id="right", name="Right", handler=fail_step, depends_on=["root"]))
+        engine.add_node(WorkflowNode(id="join", name="Join", handler=ok, depends_on=["left", "right"]))
+        engine.add_node(WorkflowNode(id="tail", name="Tail", handler=ok, depends_on=["join"]))
+
+        results = await engine.execute()
+        assert results["left"] == ["root"]
+        assert engine._nodes["right"].status == NodeStatus.FAILED
+        assert engine._nodes["join"].status == NodeStatus.SKIPPED
+        assert engine._nodes["tail"].status == NodeStatus.SKIPPED
+
+    @pytest.mark.asyncio
+    async def test_critical_path_runs_first(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode
+
+        engine = WorkflowEngine()
+        started = []
+
+        async def step(**kwargs):
+            started.append(kwargs["label"])
+
+        engine.add_node(WorkflowNode(id="short", name="Short", handler=step, metadata={"label": "short"}))
+        engine.add_node(WorkflowNode(id="long", name="Long", handler=step, metadata={"label": "long"}))
+        engine.add_node(WorkflowNode(
+            id="after", name="After", handler=step, depends_on=["long"], metadata={"label": "after"},
+        ))
+        engine.set_node_cost("long", 500)
+
+        await engine.execute()
+        assert engine._criticality["long"] > engine._criticality["short"]
+        assert started[0] == "long"
+
+    @pytest.mark.asyncio
+    async def test_cacheable_node_reuses_result(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode
+
+        engine = WorkflowEngine()
+        calls = []
+
+        async def expensive(**kwargs):
+            calls.append(kwargs["context"]["q"])
+            return kwargs["context"]["q"].upper()
+
+        node = WorkflowNode(
+            id="n", name="N", handler=expensive, cacheable=True, cache_context_keys=("q",),
+        )
+        engine.add_node(node)
+
+        assert (await engine.execute({"q": "hi"}))["n"] == "HI"
+        engine.reset()
+        assert (await engine.execute({"q": "hi"}))["n"] == "HI"
+        assert node.cached is True
+        engine.reset()
+        assert (await engine.execute({"q": "yo"}))["n"] == "YO"
+        assert calls == ["hi", "yo"]
+
+    @pytest.mark.asyncio
+    async def test_cache_separates_closures_from_one_factory(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode
+
+        def make(value):
+            async def handler(**kwargs):
+                return value
+            return handler
+
+        engine = WorkflowEngine()
+        for i in (1, 2, 3):
+            engine.add_node(WorkflowNode(id=f"n{i}", name=f"N{i}", handler=make(i), cacheable=True))
+        assert await engine.execute() == {"n1": 1, "n2": 2, "n3": 3}
+
+    @pytest.mark.asyncio
+    async def test_max_parallel_and_groups(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode
+
+        engine = WorkflowEngine(max_parallel=2)
+        engine.set_concurrency_limit("llm", 1)
+        active = {"all": 0, "llm": 0}
+        peak = {"all": 0, "llm": 0}
+
+        async def step(**kwargs):
+            group = kwargs["group"]
+            active[group] += 1
+            peak[group] = max(peak[group], active[group])
+            await asyncio.sleep(0.01)
+            active[group] -= 1
+
+        for i in range(5):
+            engine.add_node(WorkflowNode(id=f"n{i}", name="N", handler=step, metadata={"group": "all"}))
+            engine.add_node(WorkflowNode(
+                id=f"l{i}", name="L", handler=step, metadata={"group": "llm"}, concurrency_group="llm",
+            ))
+
+        await engine.execute()
+        assert peak == {"all": 2, "llm": 1}
+
+    @pytest.mark.asyncio
+    async def test_cycle_does_not_hang(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode, NodeStatus
+
+        engine = WorkflowEngine()
+
+        async def ok(**kwargs):
+            return "ok"
+
+        engine.add_node(WorkflowNode(id="free", name="Free", handler=ok))
+        engine.add_node(WorkflowNode(id="a", name="A", handler=ok, depends_on=["b"]))
+        engine.add_node(WorkflowNode(id="b", name="B", handler=ok, depends_on=["a"]))
+
+        results = await asyncio.wait_for(engine.execute(), timeout=1)
+        assert results == {"free": "ok"}
+        assert engine._nodes["a"].status == NodeStatus.PENDING
+
+    @pytest.mark.asyncio
+    async def test_fail_fast_cancels_in_flight(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode, NodeStatus
+
+        engine = WorkflowEngine(fail_fast=True)
+        finished = []
+
+        async def boom(**kwargs):
+            raise RuntimeError("boom")
+
+        async def slow(**kwargs):
+            await asyncio.sleep(1)
+            finished.append("slow")
+            return "slow"
+
+        engine.add_node(WorkflowNode(id="bad", name="Bad", handler=boom))
+        engine.add_node(WorkflowNode(id="slow", name="Slow", handler=slow))
+        engine.add_node(WorkflowNode(id="after", name="After", handler=slow, depends_on=["slow"]))
+
+        results = await asyncio.wait_for(engine.execute(), timeout=0.5)
+        assert results == {}
+        assert finished == []
+        assert engine.get_status() == {"bad": "failed", "slow": "skipped", "after": "skipped"}
+
+
+    @pytest.mark.asyncio
+    async def test_callbacks_do_not_fail_node(self):
+        from nexus.core.workflow_engine import WorkflowEngine, WorkflowNode
+
+        engine = WorkflowEngine()
+        seen = []
+
+        async def step(**kwargs):
+            return "ok"
+
+        async def async_cb(node):
+            seen.append(("async", node.id))
+
+        def sync_cb(node):
+            seen.append(("sync", node.id))
+
+        def broken_cb(node):
+            raise RuntimeError("callback bug")
+
+        async def broken_async_cb(node):
+            raise RuntimeError("async callback bug")
+
+        for cb in (async_cb, sync_cb, broken_cb, broken_async_cb):
+            engine.on_node_complete(cb)
+        engine.add_node(WorkflowNode(id="a", name="A", handler=step))
+        engine.add_node(WorkflowNode(id="b", name="B", handler=step, depends_on=["a"]))
+
+        results = await engine.execute()
+        assert results == {"a": "ok", "b": "ok"}
+        assert engine.get_status() == {"a": "completed", "b": "completed"}
+        assert sorted(seen) == [("async", "a"), ("async", "b"), ("sync", "a"), ("sync", "b")]
 
 # ── Message Queue Tests ──
 class TestMessageQueue:
@@ -319,3 +629,25 @@ class TestCommonSense:
         cs = CommonSenseFilter()
         category = cs.get_category("Write a Python function to sort")
         assert category == "coding"
+
+
+# ── Titan Protocol Tests ──
+class TestTitanProtocol:
+    def test_parse_sections_case_insensitive(self):
+        from nexus.core.titan_protocol import TitanProtocol
+
+        result = TitanProtocol.parse(
+            "[nexus_memory]\nlikes tea\n"
+            '[NEXUS_ACTION]\n[{"type": "search", "query": "tea"}]\n'
+            "[Nexus_Reply]\nSure!"
+        )
+        assert result.memory == "likes tea"
+        assert result.actions == [{"type": "search", "query": "tea"}]
+        assert result.reply == "Sure!"
+
+    def test_parse_plain_text(self):
+        from nexus.core.titan_protocol import TitanProtocol
+
+        result = TitanProtocol.parse("just an answer")
+        assert result.reply == "just an answer"
+        assert result.actions == []
@@ -147,7 +147,11 @@ function connectWebSocket() {
 
     ws.onmessage = (event) => {
         const data = JSON.parse(event.data);
-        handleEvent(data);
+        if (data.type === 'batch') {
+            data.events.forEach(handleEvent);
+        } else {
+            handleEvent(data);
+        }
     };
 
     ws.onclose = () => {
@@ -641,7 +641,12 @@ function dConnectWs(onOpen) {
         if (onOpen) onOpen();
     };
     dWs.onmessage = e => {
-        try { dHandleEvent(JSON.parse(e.data)); } catch {}
+        let data;
+        try { data = JSON.parse(e.data); } catch { return; }
+        const events = data.type === 'batch' ? data.events : [data];
+        for (const ev of events) {
+            try { dHandleEvent(ev); } catch {}
+        }
     };
     dWs.onclose = () => {
         dWsReady = false;